@@ -120,17 +120,8 @@ def _get_notification_summary(callsign: str, show_announcements: bool, show_chat
     cs = callsign.upper()
     with get_db() as conn:
         if show_announcements:
-            row = conn.execute(
-                '''SELECT COUNT(*) FROM announcements a
-                   WHERE a.is_active = 1
-                   AND NOT EXISTS (
-                       SELECT 1 FROM announcement_reads ar
-                       WHERE ar.announcement_id = a.id AND ar.operator_callsign = ?
-                   )''',
-                (cs,)
-            ).fetchone()
-            summary['unread_ann_count'] = row[0] if row else 0
-
+            # The unread list is unbounded, so its length is the unread
+            # count - no separate COUNT(*) round trip needed.
             cursor = conn.execute(
                 '''SELECT a.* FROM announcements a
                    WHERE a.is_active = 1
@@ -142,6 +133,7 @@ def _get_notification_summary(callsign: str, show_announcements: bool, show_chat
                 (cs,)
             )
             summary['unread_announcements'] = [dict(r) for r in cursor.fetchall()]
+            summary['unread_ann_count'] = len(summary['unread_announcements'])
 
         if show_chat:
             row = conn.execute(
@@ -427,6 +419,7 @@ def operator_panel():
                     ):
                         # Mark as read and navigate to announcements tab
                         db.mark_announcement_read(ann['id'], st.session_state.callsign)
+                        _get_notification_summary.clear()
                         st.session_state.go_to_announcements = True
                         st.rerun()
                     # Show preview below the button
@@ -6,6 +6,7 @@ import sqlite3
 import os
 import threading
 from contextlib import contextmanager
+from typing import List
 
 logger = logging.getLogger(__name__)
 
@@ -20,13 +21,27 @@ _local = threading.local()
 
 def _new_connection():
     """Create a fresh SQLite connection with performance PRAGMAs applied."""
-    conn = sqlite3.connect(DATABASE_PATH, check_same_thread=False, timeout=30.0)
+    # The app issues well over 128 distinct statements (the sqlite3 default
+    # LRU size), so a long-lived connection would keep evicting and
+    # re-preparing them. 256 keeps the whole working set prepared.
+    conn = sqlite3.connect(
+        DATABASE_PATH, check_same_thread=False, timeout=30.0,
+        cached_statements=256,
+    )
     conn.row_factory = sqlite3.Row
     # WAL gives us better concurrent read/write characteristics - readers
     # no longer block writers, which matters when many operators poll
     # simultaneously while someone else is blocking a band/mode.
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA synchronous=NORMAL")
+    # Keep sort/temp b-trees off disk, let the kernel map the file for
+    # reads and give each connection a 64 MiB page cache (negative = KiB).
+    # Sent as one script since the connection has no open transaction yet.
+    conn.executescript('''
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA mmap_size=268435456;
+        PRAGMA cache_size=-65536;
+    ''')
     return conn
 
 
@@ -54,14 +69,32 @@ def reset_thread_connection():
         _local.connection = None
 
 
+def fetch_dicts(cursor) -> List[dict]:
+    """Materialize a cursor's result set as a list of dicts.
+
+    Column names are read once from cursor.description and zipped onto each
+    row, which is noticeably cheaper than dict(row) per sqlite3.Row on the
+    larger listings (QSO pages/exports, chat history).
+    """
+    columns = [col[0] for col in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
 @contextmanager
-def get_db():
+def get_db(immediate: bool = False):
     """Context manager yielding the thread-local connection.
 
     Commits on success, rolls back on error. The connection itself is kept
     alive for reuse by the next caller on this thread.
+
+    With immediate=True the transaction is opened with BEGIN IMMEDIATE, so
+    the write lock is taken up front. Use it for read-then-write operations
+    so the initial SELECTs and the writes form one transaction, with no
+    later lock upgrade.
     """
     conn = get_connection()
+    if immediate and not conn.in_transaction:
+        conn.execute('BEGIN IMMEDIATE')
     try:
         yield conn
         conn.commit()
@@ -79,6 +112,9 @@ def init_database():
     _seed_data(cursor)
     _sync_chat_rooms(cursor)
     conn.commit()
+    # Refresh planner statistics for any index that changed; cheap no-op
+    # when nothing did.
+    conn.execute('PRAGMA optimize')
     # Intentionally do not close: the connection is thread-local and will
     # be reused by subsequent queries on this thread.
 
@@ -156,10 +192,6 @@ def _create_tables(cursor):
             UNIQUE(award_id, band, mode)
         )
     ''')
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_band_mode_blocks_award
-        ON band_mode_blocks(award_id)
-    ''')
     cursor.execute('''
         CREATE INDEX IF NOT EXISTS idx_band_mode_blocks_operator
         ON band_mode_blocks(operator_callsign, award_id)
@@ -220,10 +252,6 @@ def _create_tables(cursor):
             UNIQUE(announcement_id, operator_callsign)
         )
     ''')
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_announcement_reads_lookup
-        ON announcement_reads(announcement_id, operator_callsign)
-    ''')
     cursor.execute('''
         CREATE INDEX IF NOT EXISTS idx_announcement_reads_recipient
         ON announcement_reads(operator_callsign, announcement_id)
@@ -372,6 +400,13 @@ def _create_tables(cursor):
         CREATE INDEX IF NOT EXISTS idx_qso_award_op
         ON qso_log(award_id, operator_callsign, qso_date DESC, time_on DESC)
     ''')
+    # Backs the award-wide (admin) QSO page, which has no operator filter:
+    # ORDER BY qso_date DESC, time_on DESC LIMIT n becomes an index walk
+    # instead of sorting the whole award.
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_qso_award_date
+        ON qso_log(award_id, qso_date DESC, time_on DESC)
+    ''')
     # idx_qso_batch is created in _migrate_qso_log_batch_id to avoid
     # failure when batch_id column doesn't exist in old databases.
     cursor.execute('''
@@ -379,6 +414,31 @@ def _create_tables(cursor):
         ON qso_log(award_id, band, mode)
     ''')
 
+    # Cascading cleanup lives in triggers rather than ON DELETE CASCADE:
+    # enforcing foreign keys would also start rejecting rows that the app
+    # has always allowed (e.g. announcements by the env-configured admin).
+    # Deleting an award removes its blocks, rosters and chat room; deleting
+    # a chat room (directly or via the award) removes its messages and
+    # notifications.
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_chat_rooms_delete
+        AFTER DELETE ON chat_rooms
+        BEGIN
+            DELETE FROM chat_notifications WHERE room_id = OLD.id;
+            DELETE FROM chat_messages WHERE room_id = OLD.id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_awards_delete
+        AFTER DELETE ON awards
+        BEGIN
+            DELETE FROM band_mode_blocks WHERE award_id = OLD.id;
+            DELETE FROM award_managers WHERE award_id = OLD.id;
+            DELETE FROM award_members WHERE award_id = OLD.id;
+            DELETE FROM chat_rooms WHERE award_id = OLD.id;
+        END
+    ''')
+
 
 # ---------------------------------------------------------------------------
 # Migrations
@@ -396,6 +456,7 @@ def _run_migrations(cursor, conn):
     _migrate_chat_notifications_room_id(cursor)
     _migrate_chat_messages_system_source(cursor)
     _migrate_qso_log_batch_id(cursor)
+    _migrate_drop_redundant_indexes(cursor)
 
     # Create app_settings key-value table
     cursor.execute('''
@@ -557,6 +618,20 @@ def _migrate_qso_log_batch_id(cursor):
     ''')
 
 
+# Indexes that duplicate the leading columns of a UNIQUE constraint's
+# autoindex; they only cost an extra b-tree write per insert/delete.
+_REDUNDANT_INDEXES = (
+    'idx_announcement_reads_lookup',  # = UNIQUE(announcement_id, operator_callsign)
+    'idx_band_mode_blocks_award',     # prefix of UNIQUE(award_id, band, mode)
+)
+
+
+def _migrate_drop_redundant_indexes(cursor):
+    """Drop indexes superseded by UNIQUE constraint autoindexes."""
+    for name in _REDUNDANT_INDEXES:
+        cursor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
 # ---------------------------------------------------------------------------
 # Seed data & sync
 # ---------------------------------------------------------------------------
@@ -574,11 +649,7 @@ def _seed_data(cursor):
 def _sync_chat_rooms(cursor):
     """Ensure every active award has a corresponding chat room."""
     cursor.execute('''
-        SELECT a.id, a.name FROM awards a
+        INSERT OR IGNORE INTO chat_rooms (name, description, room_type, award_id)
+        SELECT a.name, '', 'award', a.id FROM awards a
         WHERE NOT EXISTS (SELECT 1 FROM chat_rooms cr WHERE cr.award_id = a.id)
     ''')
-    for row in cursor.fetchall():
-        cursor.execute(
-            "INSERT OR IGNORE INTO chat_rooms (name, description, room_type, award_id) VALUES (?, '', 'award', ?)",
-            (row[1], row[0])
-        )
@@ -1,5 +1,7 @@
 """Shared validation functions."""
 
+import re
+
 from config import MIN_PASSWORD_LENGTH
 
 
@@ -12,3 +14,19 @@ def validate_password(password: str) -> tuple[bool, str]:
     if len(password) < MIN_PASSWORD_LENGTH:
         return False, f"Password must be at least {MIN_PASSWORD_LENGTH} characters"
     return True, ""
+
+
+# Callsign format: 2-20 alphanumeric chars, may include / (EA1RFI/P).
+# Cluster logins may also carry a DXSpider SSID suffix (EA1RFI-2).
+_CALLSIGN_RE = re.compile(r'^[A-Z0-9/]{2,20}$')
+_CALLSIGN_SSID_RE = re.compile(r'^[A-Z0-9/-]{2,20}$')
+
+
+def is_valid_callsign(callsign: str, allow_ssid: bool = False) -> bool:
+    """Check a callsign's format (case-insensitive).
+
+    Anything accepted here is safe to write into a chat topic or a cluster
+    telnet session: no whitespace or control characters can get through.
+    """
+    pattern = _CALLSIGN_SSID_RE if allow_ssid else _CALLSIGN_RE
+    return bool(pattern.match(callsign.upper()))
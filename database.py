@@ -81,6 +81,7 @@ from features.qso_log import (
     ingest_adif_bytes,
     parse_adif_stream,
     export_qsos_to_adif,
+    export_award_qsos_to_adif,
     get_qso_stats,
     get_qsos_by_date,
     get_qsos_by_hour,
@@ -200,6 +201,7 @@ __all__ = [
     'ingest_adif_bytes',
     'parse_adif_stream',
     'export_qsos_to_adif',
+    'export_award_qsos_to_adif',
     'get_qso_stats',
     'get_qsos_by_date',
     'get_qsos_by_hour',
@@ -9,6 +9,81 @@ from core.database import get_db
 logger = logging.getLogger(__name__)
 
 
+# SQL is kept at module level so the function bodies read as plain Python
+# and statements shared by several functions are written once.
+_SQL_INSERT_ANNOUNCEMENT = (
+    'INSERT INTO announcements (title, content, created_by) VALUES (?, ?, ?)'
+)
+
+_SQL_SELECT_ALL_ANNOUNCEMENTS = '''
+    SELECT id, title, content, created_by, created_at, is_active
+    FROM announcements
+    ORDER BY created_at DESC
+'''
+
+_SQL_SELECT_ACTIVE_ANNOUNCEMENTS = '''
+    SELECT id, title, content, created_by, created_at, is_active
+    FROM announcements
+    WHERE is_active = 1
+    ORDER BY created_at DESC
+'''
+
+_SQL_TOGGLE_ANNOUNCEMENT = '''
+    UPDATE announcements
+    SET is_active = CASE WHEN is_active = 1 THEN 0 ELSE 1 END
+    WHERE id = ?
+'''
+
+_SQL_DELETE_ANNOUNCEMENT_READS = 'DELETE FROM announcement_reads WHERE announcement_id = ?'
+_SQL_DELETE_ANNOUNCEMENT = 'DELETE FROM announcements WHERE id = ?'
+
+_SQL_MARK_READ = (
+    'INSERT OR IGNORE INTO announcement_reads (announcement_id, operator_callsign) '
+    'VALUES (?, ?)'
+)
+
+# Marks every unread active announcement in one statement; rowcount is the
+# number of announcements newly marked.
+_SQL_MARK_ALL_READ = '''
+    INSERT OR IGNORE INTO announcement_reads (announcement_id, operator_callsign)
+    SELECT a.id, ?
+    FROM announcements a
+    LEFT JOIN announcement_reads ar
+        ON ar.announcement_id = a.id AND ar.operator_callsign = ?
+    WHERE a.is_active = 1 AND ar.id IS NULL
+'''
+
+# Anti-join rather than NOT IN (subquery), so SQLite probes the
+# UNIQUE(announcement_id, operator_callsign) autoindex once per announcement.
+_SQL_COUNT_UNREAD = '''
+    SELECT COUNT(*)
+    FROM announcements a
+    LEFT JOIN announcement_reads ar
+        ON ar.announcement_id = a.id AND ar.operator_callsign = ?
+    WHERE a.is_active = 1 AND ar.id IS NULL
+'''
+
+_SQL_SELECT_UNREAD = '''
+    SELECT a.id, a.title, a.content, a.created_by, a.created_at
+    FROM announcements a
+    LEFT JOIN announcement_reads ar
+        ON ar.announcement_id = a.id AND ar.operator_callsign = ?
+    WHERE a.is_active = 1 AND ar.id IS NULL
+    ORDER BY a.created_at DESC
+'''
+
+_SQL_SELECT_WITH_READ_STATUS = '''
+    SELECT
+        a.id, a.title, a.content, a.created_by, a.created_at, a.is_active,
+        CASE WHEN ar.id IS NOT NULL THEN 1 ELSE 0 END as is_read
+    FROM announcements a
+    LEFT JOIN announcement_reads ar
+        ON a.id = ar.announcement_id AND ar.operator_callsign = ?
+    WHERE a.is_active = 1
+    ORDER BY a.created_at DESC
+'''
+
+
 def create_announcement(title: str, content: str, created_by: str) -> Tuple[bool, str]:
     """
     Create a new announcement.
@@ -24,10 +99,7 @@ def create_announcement(title: str, content: str, created_by: str) -> Tuple[bool
     try:
         with get_db() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO announcements (title, content, created_by)
-                VALUES (?, ?, ?)
-            ''', (title, content, created_by))
+            cursor.execute(_SQL_INSERT_ANNOUNCEMENT, (title, content, created_by))
             return True, "Announcement created successfully"
     except Exception:
         logger.exception("Error creating announcement")
@@ -43,11 +115,7 @@ def get_all_announcements() -> List[dict]:
     """
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute('''
-            SELECT id, title, content, created_by, created_at, is_active
-            FROM announcements
-            ORDER BY created_at DESC
-        ''')
+        cursor.execute(_SQL_SELECT_ALL_ANNOUNCEMENTS)
         return [dict(row) for row in cursor.fetchall()]
 
 
@@ -60,12 +128,7 @@ def get_active_announcements() -> List[dict]:
     """
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute('''
-            SELECT id, title, content, created_by, created_at, is_active
-            FROM announcements
-            WHERE is_active = 1
-            ORDER BY created_at DESC
-        ''')
+        cursor.execute(_SQL_SELECT_ACTIVE_ANNOUNCEMENTS)
         return [dict(row) for row in cursor.fetchall()]
 
 
@@ -82,11 +145,7 @@ def toggle_announcement_status(announcement_id: int) -> Tuple[bool, str]:
     try:
         with get_db() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE announcements
-                SET is_active = CASE WHEN is_active = 1 THEN 0 ELSE 1 END
-                WHERE id = ?
-            ''', (announcement_id,))
+            cursor.execute(_SQL_TOGGLE_ANNOUNCEMENT, (announcement_id,))
 
             if cursor.rowcount == 0:
                 return False, "Announcement not found"
@@ -111,9 +170,9 @@ def delete_announcement(announcement_id: int) -> Tuple[bool, str]:
         with get_db() as conn:
             cursor = conn.cursor()
             # Delete read records first (foreign key)
-            cursor.execute('DELETE FROM announcement_reads WHERE announcement_id = ?', (announcement_id,))
+            cursor.execute(_SQL_DELETE_ANNOUNCEMENT_READS, (announcement_id,))
             # Delete the announcement
-            cursor.execute('DELETE FROM announcements WHERE id = ?', (announcement_id,))
+            cursor.execute(_SQL_DELETE_ANNOUNCEMENT, (announcement_id,))
 
             if cursor.rowcount == 0:
                 return False, "Announcement not found"
@@ -138,10 +197,7 @@ def mark_announcement_read(announcement_id: int, operator_callsign: str) -> Tupl
     try:
         with get_db() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                INSERT OR IGNORE INTO announcement_reads (announcement_id, operator_callsign)
-                VALUES (?, ?)
-            ''', (announcement_id, operator_callsign))
+            cursor.execute(_SQL_MARK_READ, (announcement_id, operator_callsign))
             return True, "Announcement marked as read"
     except Exception:
         logger.exception("Error marking announcement as read")
@@ -161,25 +217,8 @@ def mark_all_announcements_read(operator_callsign: str) -> Tuple[bool, str]:
     try:
         with get_db() as conn:
             cursor = conn.cursor()
-            # Get all active announcement IDs not yet read by this operator
-            cursor.execute('''
-                SELECT id FROM announcements
-                WHERE is_active = 1 AND id NOT IN (
-                    SELECT announcement_id FROM announcement_reads
-                    WHERE operator_callsign = ?
-                )
-            ''', (operator_callsign,))
-
-            unread_ids = [row[0] for row in cursor.fetchall()]
-
-            # Mark each as read
-            for ann_id in unread_ids:
-                cursor.execute('''
-                    INSERT OR IGNORE INTO announcement_reads (announcement_id, operator_callsign)
-                    VALUES (?, ?)
-                ''', (ann_id, operator_callsign))
-
-            return True, f"Marked {len(unread_ids)} announcements as read"
+            cursor.execute(_SQL_MARK_ALL_READ, (operator_callsign, operator_callsign))
+            return True, f"Marked {cursor.rowcount} announcements as read"
     except Exception:
         logger.exception("Error marking announcements as read")
         return False, "An unexpected error occurred. Please try again."
@@ -197,13 +236,7 @@ def get_unread_announcement_count(operator_callsign: str) -> int:
     """
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute('''
-            SELECT COUNT(*) FROM announcements
-            WHERE is_active = 1 AND id NOT IN (
-                SELECT announcement_id FROM announcement_reads
-                WHERE operator_callsign = ?
-            )
-        ''', (operator_callsign,))
+        cursor.execute(_SQL_COUNT_UNREAD, (operator_callsign,))
         return cursor.fetchone()[0]
 
 
@@ -219,15 +252,7 @@ def get_unread_announcements(operator_callsign: str) -> List[dict]:
     """
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute('''
-            SELECT id, title, content, created_by, created_at
-            FROM announcements
-            WHERE is_active = 1 AND id NOT IN (
-                SELECT announcement_id FROM announcement_reads
-                WHERE operator_callsign = ?
-            )
-            ORDER BY created_at DESC
-        ''', (operator_callsign,))
+        cursor.execute(_SQL_SELECT_UNREAD, (operator_callsign,))
         return [dict(row) for row in cursor.fetchall()]
 
 
@@ -243,14 +268,5 @@ def get_announcements_with_read_status(operator_callsign: str) -> List[dict]:
     """
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute('''
-            SELECT
-                a.id, a.title, a.content, a.created_by, a.created_at, a.is_active,
-                CASE WHEN ar.id IS NOT NULL THEN 1 ELSE 0 END as is_read
-            FROM announcements a
-            LEFT JOIN announcement_reads ar
-                ON a.id = ar.announcement_id AND ar.operator_callsign = ?
-            WHERE a.is_active = 1
-            ORDER BY a.created_at DESC
-        ''', (operator_callsign,))
+        cursor.execute(_SQL_SELECT_WITH_READ_STATUS, (operator_callsign,))
         return [dict(row) for row in cursor.fetchall()]
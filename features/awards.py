@@ -5,11 +5,67 @@ import logging
 import sqlite3
 from typing import List, Tuple, Optional
 
-from core.database import get_db
+from core.database import fetch_dicts, get_db
 
 logger = logging.getLogger(__name__)
 
 
+# SQL lives at module level so the column list shared by the listing
+# queries is written once.
+
+# Everything except the image BLOB; has_image is answered from the record
+# header so the image bytes are only read through get_award_image().
+_AWARD_LIST_COLUMNS = (
+    'id, name, description, start_date, end_date, is_active, '
+    'is_restricted, qrz_link, image_type, created_at, '
+    'COALESCE(length(image_data), 0) > 0 AS has_image'
+)
+
+_SQL_INSERT_AWARD = '''
+    INSERT INTO awards (name, description, start_date, end_date, image_data, image_type, qrz_link)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_SELECT_ALL_AWARDS = f'''
+    SELECT {_AWARD_LIST_COLUMNS} FROM awards
+    ORDER BY created_at DESC
+'''
+
+_SQL_SELECT_ACTIVE_AWARDS = f'''
+    SELECT {_AWARD_LIST_COLUMNS} FROM awards
+    WHERE is_active = 1
+    ORDER BY created_at DESC
+'''
+
+_SQL_SELECT_AWARD = f'SELECT {_AWARD_LIST_COLUMNS} FROM awards WHERE id = ?'
+
+_SQL_UPDATE_AWARD = '''
+    UPDATE awards
+    SET name = ?, description = ?, start_date = ?, end_date = ?, qrz_link = ?
+    WHERE id = ?
+'''
+
+_SQL_UPDATE_AWARD_IMAGE = '''
+    UPDATE awards
+    SET image_data = ?, image_type = ?
+    WHERE id = ?
+'''
+
+# Only the type and size; the bytes are read through incremental blob I/O.
+_SQL_SELECT_AWARD_IMAGE_INFO = (
+    'SELECT image_type, COALESCE(length(image_data), 0) AS image_size '
+    'FROM awards WHERE id = ?'
+)
+
+# Flip and read back in one statement (RETURNING needs SQLite >= 3.35).
+_SQL_TOGGLE_AWARD = '''
+    UPDATE awards
+    SET is_active = CASE WHEN is_active THEN 0 ELSE 1 END
+    WHERE id = ?
+    RETURNING name, is_active
+'''
+
+
 def create_award(name: str, description: str = "", start_date: str = "", end_date: str = "",
                  image_data: Optional[bytes] = None, image_type: Optional[str] = None,
                  qrz_link: str = "") -> Tuple[bool, str, Optional[int]]:
@@ -17,10 +73,8 @@ def create_award(name: str, description: str = "", start_date: str = "", end_dat
     try:
         with get_db() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO awards (name, description, start_date, end_date, image_data, image_type, qrz_link)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (name, description, start_date, end_date, image_data, image_type, qrz_link))
+            cursor.execute(_SQL_INSERT_AWARD, (name, description, start_date, end_date,
+                                               image_data, image_type, qrz_link))
             award_id = cursor.lastrowid
             return True, f"Award '{name}' created successfully", award_id
     except sqlite3.IntegrityError:
@@ -30,42 +84,23 @@ def create_award(name: str, description: str = "", start_date: str = "", end_dat
         return False, "An unexpected error occurred. Please try again.", None
 
 
-_AWARD_LIST_COLUMNS = (
-    'id, name, description, start_date, end_date, is_active, '
-    'is_restricted, qrz_link, image_type, created_at'
-)
-
-
 def get_all_awards() -> List[dict]:
     """Get all awards (metadata only; BLOB image_data excluded)."""
     with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute(f'''
-            SELECT {_AWARD_LIST_COLUMNS} FROM awards
-            ORDER BY created_at DESC
-        ''')
-        results = cursor.fetchall()
-        return [dict(row) for row in results]
+        return fetch_dicts(conn.execute(_SQL_SELECT_ALL_AWARDS))
 
 
 def get_active_awards() -> List[dict]:
     """Get only active awards (metadata only; BLOB image_data excluded)."""
     with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute(f'''
-            SELECT {_AWARD_LIST_COLUMNS} FROM awards
-            WHERE is_active = 1
-            ORDER BY created_at DESC
-        ''')
-        results = cursor.fetchall()
-        return [dict(row) for row in results]
+        return fetch_dicts(conn.execute(_SQL_SELECT_ACTIVE_AWARDS))
 
 
 def get_award_by_id(award_id: int) -> Optional[dict]:
     """Get a specific award by ID."""
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute('SELECT * FROM awards WHERE id = ?', (award_id,))
+        cursor.execute(_SQL_SELECT_AWARD, (award_id,))
         result = cursor.fetchone()
         return dict(result) if result else None
 
@@ -75,11 +110,7 @@ def update_award(award_id: int, name: str, description: str, start_date: str, en
     try:
         with get_db() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE awards
-                SET name = ?, description = ?, start_date = ?, end_date = ?, qrz_link = ?
-                WHERE id = ?
-            ''', (name, description, start_date, end_date, qrz_link, award_id))
+            cursor.execute(_SQL_UPDATE_AWARD, (name, description, start_date, end_date, qrz_link, award_id))
 
             if cursor.rowcount == 0:
                 return False, "Award not found"
@@ -97,11 +128,7 @@ def update_award_image(award_id: int, image_data: Optional[bytes], image_type: O
     try:
         with get_db() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE awards
-                SET image_data = ?, image_type = ?
-                WHERE id = ?
-            ''', (image_data, image_type, award_id))
+            cursor.execute(_SQL_UPDATE_AWARD_IMAGE, (image_data, image_type, award_id))
 
             if cursor.rowcount == 0:
                 return False, "Award not found"
@@ -113,14 +140,17 @@ def update_award_image(award_id: int, image_data: Optional[bytes], image_type: O
 
 
 def get_award_image(award_id: int) -> Optional[Tuple[bytes, str]]:
-    """Get the image data and type for an award."""
+    """Get the image data and type for an award.
+
+    The BLOB is read with Connection.blobopen(), which copies it straight
+    into the returned bytes instead of assembling it in a row buffer first.
+    """
     with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute('SELECT image_data, image_type FROM awards WHERE id = ?', (award_id,))
-        result = cursor.fetchone()
-        if result and result['image_data']:
-            return result['image_data'], result['image_type']
-        return None
+        result = conn.execute(_SQL_SELECT_AWARD_IMAGE_INFO, (award_id,)).fetchone()
+        if not result or not result['image_size']:
+            return None
+        with conn.blobopen('awards', 'image_data', award_id, readonly=True) as blob:
+            return blob.read(), result['image_type']
 
 
 def toggle_award_status(award_id: int) -> Tuple[bool, str]:
@@ -128,16 +158,13 @@ def toggle_award_status(award_id: int) -> Tuple[bool, str]:
     try:
         with get_db() as conn:
             cursor = conn.cursor()
-            cursor.execute('SELECT is_active, name FROM awards WHERE id = ?', (award_id,))
+            cursor.execute(_SQL_TOGGLE_AWARD, (award_id,))
             award = cursor.fetchone()
 
             if not award:
                 return False, "Award not found"
 
-            new_status = 0 if award['is_active'] else 1
-            cursor.execute('UPDATE awards SET is_active = ? WHERE id = ?', (new_status, award_id))
-
-            status_text = "activated" if new_status else "deactivated"
+            status_text = "activated" if award['is_active'] else "deactivated"
             return True, f"Award '{award['name']}' {status_text}"
     except Exception:
         logger.exception("Error toggling award status")
@@ -145,36 +172,20 @@ def toggle_award_status(award_id: int) -> Tuple[bool, str]:
 
 
 def delete_award(award_id: int) -> Tuple[bool, str]:
-    """Delete an award and all its associated blocks, chat room and chat messages."""
+    """Delete an award and all its associated blocks, chat room and chat messages.
+
+    The dependent rows are removed by the trg_awards_delete and
+    trg_chat_rooms_delete triggers in the same statement.
+    """
     try:
         with get_db() as conn:
             cursor = conn.cursor()
-
-            cursor.execute('SELECT name FROM awards WHERE id = ?', (award_id,))
+            cursor.execute('DELETE FROM awards WHERE id = ? RETURNING name', (award_id,))
             award = cursor.fetchone()
 
             if not award:
                 return False, "Award not found"
 
-            # Delete all blocks associated with this award
-            cursor.execute('DELETE FROM band_mode_blocks WHERE award_id = ?', (award_id,))
-
-            # Clean up per-award access rosters
-            cursor.execute('DELETE FROM award_managers WHERE award_id = ?', (award_id,))
-            cursor.execute('DELETE FROM award_members WHERE award_id = ?', (award_id,))
-
-            # Delete the linked chat room and its messages/notifications
-            cursor.execute('SELECT id FROM chat_rooms WHERE award_id = ?', (award_id,))
-            room = cursor.fetchone()
-            if room:
-                room_id = room[0]
-                cursor.execute('DELETE FROM chat_notifications WHERE room_id = ?', (room_id,))
-                cursor.execute('DELETE FROM chat_messages WHERE room_id = ?', (room_id,))
-                cursor.execute('DELETE FROM chat_rooms WHERE id = ?', (room_id,))
-
-            # Delete the award
-            cursor.execute('DELETE FROM awards WHERE id = ?', (award_id,))
-
             return True, f"Award '{award['name']}' and all associated data deleted"
     except Exception:
         logger.exception("Error deleting award")
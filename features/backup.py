@@ -4,14 +4,16 @@ Database backup and restore functions.
 import logging
 import sqlite3
 import os
-import shutil
 import tempfile
 from typing import Tuple
 
-from core.database import get_connection, get_db, DATABASE_PATH, reset_thread_connection
+from core.database import get_connection, get_db, DATABASE_PATH
 
 logger = logging.getLogger(__name__)
 
+# Tables a backup must contain to be accepted for restore.
+_REQUIRED_TABLES = ('operators', 'awards', 'band_mode_blocks')
+
 
 def get_database_backup() -> bytes:
     """
@@ -24,29 +26,47 @@ def get_database_backup() -> bytes:
     # it is shared and will be used by subsequent queries.
     source_conn = get_connection()
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.db') as tmp_file:
-        tmp_path = tmp_file.name
-
+    # Copy into an in-memory database and serialize its pages straight to
+    # bytes, so the backup never touches disk or gets read back from a
+    # temp file.
+    backup_conn = sqlite3.connect(':memory:')
     try:
-        backup_conn = sqlite3.connect(tmp_path)
-        try:
-            source_conn.backup(backup_conn)
-        finally:
-            backup_conn.close()
+        source_conn.backup(backup_conn)
+        return backup_conn.serialize()
+    finally:
+        backup_conn.close()
 
-        with open(tmp_path, 'rb') as f:
-            backup_data = f.read()
 
-        return backup_data
-    finally:
-        if os.path.exists(tmp_path):
-            os.remove(tmp_path)
+def _rebuild_at_page_size(conn: sqlite3.Connection, page_size: int,
+                          path: str) -> sqlite3.Connection:
+    """Copy conn's database to path and VACUUM it to page_size.
+
+    The backup API cannot write into a WAL-mode database whose page size
+    differs from the source's, and an in-memory database cannot change its
+    page size, so the rebuild goes through a rollback-mode file.
+    """
+    rebuilt = sqlite3.connect(path)
+    try:
+        conn.backup(rebuilt)
+        rebuilt.execute(f'PRAGMA page_size={int(page_size)}')
+        rebuilt.execute('VACUUM')
+    except Exception:
+        rebuilt.close()
+        raise
+    return rebuilt
 
 
 def restore_database_from_backup(backup_data: bytes) -> Tuple[bool, str]:
     """
     Restore the database from a backup.
 
+    The validated image is copied into the live database with the SQLite
+    backup API rather than by replacing the file. The copy runs as one
+    write transaction under SQLite's own locking, so connections held by
+    other threads and processes (Telegram bot, MQTT subscriber, other
+    sessions) simply see the new contents on their next read, the WAL stays
+    consistent, and a failed copy leaves the previous database untouched.
+
     Args:
         backup_data: The database file content as bytes
 
@@ -56,44 +76,63 @@ def restore_database_from_backup(backup_data: bytes) -> Tuple[bool, str]:
     if not backup_data.startswith(b'SQLite format 3'):
         return False, "Invalid backup file: Not a valid SQLite database"
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.db') as tmp_file:
-        tmp_path = tmp_file.name
-        tmp_file.write(backup_data)
-
+    test_conn = None
     try:
-        test_conn = sqlite3.connect(tmp_path)
+        # Validate entirely in memory so a bad upload never touches disk.
+        # The in-memory VFS cannot open WAL-mode images, so a file copied
+        # from a live WAL database is checked with its journal-mode header
+        # bytes (18-19) reset to rollback; the pages are unchanged.
+        image = backup_data
+        if image[18:20] != b'\x01\x01':
+            image = bytearray(image)
+            image[18:20] = b'\x01\x01'
+        test_conn = sqlite3.connect(':memory:')
+        test_conn.deserialize(image)
         test_cursor = test_conn.cursor()
 
-        test_cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = [row[0] for row in test_cursor.fetchall()]
-
-        required_tables = ['operators', 'awards', 'band_mode_blocks']
-        missing_tables = [t for t in required_tables if t not in tables]
+        # Ask only for the required tables; the ones not returned are missing.
+        test_cursor.execute(
+            f"SELECT name FROM sqlite_master WHERE type='table' "
+            f"AND name IN ({', '.join('?' * len(_REQUIRED_TABLES))})",
+            _REQUIRED_TABLES,
+        )
+        tables = {row[0] for row in test_cursor.fetchall()}
+        missing_tables = [t for t in _REQUIRED_TABLES if t not in tables]
 
         if missing_tables:
-            test_conn.close()
             return False, f"Invalid backup: Missing required tables: {', '.join(missing_tables)}"
 
-        test_conn.close()
+        # quick_check skips the index cross-checks of integrity_check but
+        # still walks every page, so truncated uploads fail here rather
+        # than after they have replaced the live database.
+        test_cursor.execute("PRAGMA quick_check(1)")
+        check = test_cursor.fetchone()[0]
+        if check != 'ok':
+            return False, "Invalid backup file: database is corrupted"
 
-        current_backup_path = DATABASE_PATH + '.bak'
-        if os.path.exists(DATABASE_PATH):
-            shutil.copy2(DATABASE_PATH, current_backup_path)
+        image_page_size = test_cursor.execute('PRAGMA page_size').fetchone()[0]
 
         try:
-            # Drop any cached connection that still points at the old file
-            # so subsequent queries re-open against the restored database.
-            reset_thread_connection()
-            shutil.copy2(tmp_path, DATABASE_PATH)
+            # backup() holds the live database's write lock for the whole
+            # copy and commits it atomically; on any error the transaction
+            # is rolled back and the previous contents are preserved.
+            live_conn = get_connection()
+            live_page_size = live_conn.execute('PRAGMA page_size').fetchone()[0]
+            if image_page_size == live_page_size:
+                test_conn.backup(live_conn)
+            else:
+                with tempfile.TemporaryDirectory() as tmp_dir:
+                    rebuilt = _rebuild_at_page_size(
+                        test_conn, live_page_size, os.path.join(tmp_dir, 'restore.db')
+                    )
+                    try:
+                        rebuilt.backup(live_conn)
+                    finally:
+                        rebuilt.close()
             return True, "Database restored successfully"
         except Exception:
             logger.exception("Error restoring database")
-            if os.path.exists(current_backup_path):
-                shutil.copy2(current_backup_path, DATABASE_PATH)
             return False, "An unexpected error occurred while restoring. Previous database has been preserved."
-        finally:
-            if os.path.exists(current_backup_path):
-                os.remove(current_backup_path)
 
     except sqlite3.DatabaseError:
         logger.exception("Invalid backup file")
@@ -102,8 +141,8 @@ def restore_database_from_backup(backup_data: bytes) -> Tuple[bool, str]:
         logger.exception("Error validating backup")
         return False, "An unexpected error occurred while validating the backup."
     finally:
-        if os.path.exists(tmp_path):
-            os.remove(tmp_path)
+        if test_conn is not None:
+            test_conn.close()
 
 
 def get_database_info() -> dict:
@@ -118,14 +157,12 @@ def get_database_info() -> dict:
 
         info = {}
 
-        cursor.execute("SELECT COUNT(*) FROM operators")
-        info['operators_count'] = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(*) FROM awards")
-        info['awards_count'] = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(*) FROM band_mode_blocks")
-        info['blocks_count'] = cursor.fetchone()[0]
+        cursor.execute('''
+            SELECT (SELECT COUNT(*) FROM operators),
+                   (SELECT COUNT(*) FROM awards),
+                   (SELECT COUNT(*) FROM band_mode_blocks)
+        ''')
+        info['operators_count'], info['awards_count'], info['blocks_count'] = cursor.fetchone()
 
         if os.path.exists(DATABASE_PATH):
             info['file_size'] = os.path.getsize(DATABASE_PATH)
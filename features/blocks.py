@@ -1,11 +1,10 @@
 """
 Band/mode block management functions.
 """
-import json
 import logging
 from typing import List, Tuple, Optional
 
-from core.database import get_db
+from core.database import fetch_dicts, get_db
 from features.events import post_system_event_to_award_room
 
 logger = logging.getLogger(__name__)
@@ -16,12 +15,15 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 def _open_history_record(cursor, award_id, operator_callsign, band, mode):
-    """Insert a new open history row (unblocked_at=NULL)."""
+    """Insert a new open history row (unblocked_at=NULL).
+
+    operator_callsign must already be upper-cased.
+    """
     cursor.execute(
         '''INSERT INTO block_history
              (award_id, operator_callsign, band, mode, blocked_at)
            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)''',
-        (award_id, operator_callsign.upper(), band, mode),
+        (award_id, operator_callsign, band, mode),
     )
 
 
@@ -29,9 +31,10 @@ def _close_history_records(cursor, award_id, operator_callsign, band=None, mode=
     """Close open history rows by setting unblocked_at + duration.
 
     If band/mode are None, closes ALL open rows for the operator on that award.
+    operator_callsign must already be upper-cased.
     """
     where = "award_id = ? AND operator_callsign = ? AND unblocked_at IS NULL"
-    params = [award_id, operator_callsign.upper()]
+    params = [award_id, operator_callsign]
     if band is not None:
         where += " AND band = ? AND mode = ?"
         params.extend([band, mode])
@@ -61,129 +64,132 @@ def block_band_mode(operator_callsign: str, band: str, mode: str, award_id: int,
 
     if not can_block_on_award(operator_callsign, award_id, is_admin=is_admin):
         return False, "You are not a member of this award. Ask a manager to add you."
+    callsign = operator_callsign.upper()
     try:
-        with get_db() as conn:
+        with get_db(immediate=True) as conn:
             cursor = conn.cursor()
 
-            # Check if this band/mode is already blocked by someone else in this award
+            # Claim the band/mode; the UNIQUE(award_id, band, mode) index
+            # turns a collision into "no row returned".
             cursor.execute('''
-                SELECT operator_callsign FROM band_mode_blocks
-                WHERE band = ? AND mode = ? AND award_id = ?
-            ''', (band, mode, award_id))
-            existing = cursor.fetchone()
+                INSERT INTO band_mode_blocks (operator_callsign, award_id, band, mode)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(award_id, band, mode) DO NOTHING
+                RETURNING id
+            ''', (callsign, award_id, band, mode))
+            claimed = cursor.fetchone()
 
-            if existing:
+            if not claimed:
+                cursor.execute('''
+                    SELECT operator_callsign FROM band_mode_blocks
+                    WHERE band = ? AND mode = ? AND award_id = ?
+                ''', (band, mode, award_id))
+                existing = cursor.fetchone()
                 return False, f"Band {band} / Mode {mode} is already blocked by {existing['operator_callsign']}"
 
-            # Check if operator already has a block in this award (one block per operator per award rule)
+            # One block per operator per award: release whatever else this
+            # operator was holding and close its history.
             cursor.execute('''
-                SELECT band, mode FROM band_mode_blocks
-                WHERE operator_callsign = ? AND award_id = ?
-            ''', (operator_callsign.upper(), award_id))
-            existing_block = cursor.fetchone()
-
-            if existing_block:
-                # Close the history record for the old block
+                DELETE FROM band_mode_blocks
+                WHERE operator_callsign = ? AND award_id = ? AND id != ?
+                RETURNING band, mode
+            ''', (callsign, award_id, claimed['id']))
+            released = cursor.fetchall()
+            existing_block = released[0] if released else None
+            for old in released:
                 _close_history_records(
-                    cursor, award_id, operator_callsign,
-                    existing_block['band'], existing_block['mode'],
+                    cursor, award_id, callsign, old['band'], old['mode'],
                 )
-                # Auto-unblock the previous block
-                cursor.execute('''
-                    DELETE FROM band_mode_blocks
-                    WHERE operator_callsign = ? AND award_id = ?
-                ''', (operator_callsign.upper(), award_id))
-
-            # Block the new band/mode
-            cursor.execute('''
-                INSERT INTO band_mode_blocks (operator_callsign, award_id, band, mode)
-                VALUES (?, ?, ?, ?)
-            ''', (operator_callsign.upper(), award_id, band, mode))
 
             # Open a new history record
-            _open_history_record(cursor, award_id, operator_callsign, band, mode)
+            _open_history_record(cursor, award_id, callsign, band, mode)
 
         if existing_block:
-            event_data = json.dumps({
+            event_data = {
                 'event': 'switched',
-                'callsign': operator_callsign.upper(),
+                'callsign': callsign,
                 'old_band': existing_block['band'],
                 'old_mode': existing_block['mode'],
                 'band': band,
                 'mode': mode,
-            })
+            }
             post_system_event_to_award_room(award_id, event_data)
             return True, f"Successfully blocked (previous block {existing_block['band']}/{existing_block['mode']} released)"
 
-        event_data = json.dumps({
+        event_data = {
             'event': 'blocked',
-            'callsign': operator_callsign.upper(),
+            'callsign': callsign,
             'band': band,
             'mode': mode,
-        })
+        }
         post_system_event_to_award_room(award_id, event_data)
         return True, "Successfully blocked"
-    except Exception as e:
-        print(f"Error blocking band/mode: {e}")
-        return False, str(e)
+    except Exception:
+        logger.exception("Error blocking band/mode")
+        return False, "An unexpected error occurred. Please try again."
 
 
 def unblock_band_mode(operator_callsign: str, band: str, mode: str, award_id: int) -> Tuple[bool, str]:
     """Unblock a band/mode combination for a specific award."""
+    callsign = operator_callsign.upper()
     try:
-        with get_db() as conn:
+        with get_db(immediate=True) as conn:
             cursor = conn.cursor()
 
             cursor.execute('''
-                SELECT operator_callsign FROM band_mode_blocks
-                WHERE band = ? AND mode = ? AND award_id = ?
-            ''', (band, mode, award_id))
-            existing = cursor.fetchone()
-
-            if not existing:
-                return False, f"Band {band} / Mode {mode} is not blocked"
+                DELETE FROM band_mode_blocks
+                WHERE band = ? AND mode = ? AND award_id = ? AND operator_callsign = ?
+            ''', (band, mode, award_id, callsign))
 
-            if existing['operator_callsign'] != operator_callsign.upper():
+            if cursor.rowcount == 0:
+                # Nothing of ours was deleted - look up why for the message.
+                cursor.execute('''
+                    SELECT operator_callsign FROM band_mode_blocks
+                    WHERE band = ? AND mode = ? AND award_id = ?
+                ''', (band, mode, award_id))
+                existing = cursor.fetchone()
+                if not existing:
+                    return False, f"Band {band} / Mode {mode} is not blocked"
                 return False, f"Band {band} / Mode {mode} is blocked by {existing['operator_callsign']}, not by you"
 
             # Close the history record
-            _close_history_records(cursor, award_id, operator_callsign, band, mode)
+            _close_history_records(cursor, award_id, callsign, band, mode)
 
-            cursor.execute('''
-                DELETE FROM band_mode_blocks
-                WHERE band = ? AND mode = ? AND award_id = ?
-            ''', (band, mode, award_id))
-
-        event_data = json.dumps({
+        event_data = {
             'event': 'unblocked',
-            'callsign': operator_callsign.upper(),
+            'callsign': callsign,
             'band': band,
             'mode': mode,
-        })
+        }
         post_system_event_to_award_room(award_id, event_data)
         return True, "Successfully unblocked"
-    except Exception as e:
-        print(f"Error unblocking band/mode: {e}")
-        return False, str(e)
+    except Exception:
+        logger.exception("Error unblocking band/mode")
+        return False, "An unexpected error occurred. Please try again."
 
 
 def unblock_all_for_operator(operator_callsign: str, award_id: Optional[int] = None) -> Tuple[bool, str, int]:
     """Unblock all band/mode combinations for an operator, optionally for a specific award."""
+    callsign = operator_callsign.upper()
     try:
         blocks_removed = []
-        with get_db() as conn:
+        with get_db(immediate=True) as conn:
             cursor = conn.cursor()
 
+            # Delete and collect in one statement; the returned rows drive
+            # history closing and the per-award events below.
             if award_id:
                 cursor.execute('''
-                    SELECT band, mode, award_id FROM band_mode_blocks
+                    DELETE FROM band_mode_blocks
                     WHERE operator_callsign = ? AND award_id = ?
-                ''', (operator_callsign.upper(), award_id))
+                    RETURNING band, mode, award_id
+                ''', (callsign, award_id))
             else:
                 cursor.execute('''
-                    SELECT band, mode, award_id FROM band_mode_blocks
+                    DELETE FROM band_mode_blocks
                     WHERE operator_callsign = ?
-                ''', (operator_callsign.upper(),))
+                    RETURNING band, mode, award_id
+                ''', (callsign,))
             blocks_removed = [dict(row) for row in cursor.fetchall()]
             count = len(blocks_removed)
 
@@ -192,33 +198,22 @@ def unblock_all_for_operator(operator_callsign: str, award_id: Optional[int] = N
 
             # Close all history records for these blocks
             if award_id:
-                _close_history_records(cursor, award_id, operator_callsign)
+                _close_history_records(cursor, award_id, callsign)
             else:
                 # Close records across all awards
                 for block in blocks_removed:
                     _close_history_records(
-                        cursor, block['award_id'], operator_callsign,
+                        cursor, block['award_id'], callsign,
                         block['band'], block['mode'],
                     )
 
-            if award_id:
-                cursor.execute('''
-                    DELETE FROM band_mode_blocks
-                    WHERE operator_callsign = ? AND award_id = ?
-                ''', (operator_callsign.upper(), award_id))
-            else:
-                cursor.execute('''
-                    DELETE FROM band_mode_blocks
-                    WHERE operator_callsign = ?
-                ''', (operator_callsign.upper(),))
-
         for block in blocks_removed:
-            event_data = json.dumps({
+            event_data = {
                 'event': 'unblocked',
-                'callsign': operator_callsign.upper(),
+                'callsign': callsign,
                 'band': block['band'],
                 'mode': block['mode'],
-            })
+            }
             post_system_event_to_award_room(block['award_id'], event_data)
 
         return True, f"Released {count} block(s)", count
@@ -231,7 +226,7 @@ def admin_unblock_band_mode(band: str, mode: str, award_id: int,
                             admin_callsign: str = '') -> Tuple[bool, str]:
     """Admin unblock any band/mode combination for a specific award."""
     try:
-        with get_db() as conn:
+        with get_db(immediate=True) as conn:
             cursor = conn.cursor()
 
             cursor.execute('''
@@ -240,6 +235,9 @@ def admin_unblock_band_mode(band: str, mode: str, award_id: int,
             ''', (band, mode, award_id))
             existing = cursor.fetchone()
 
+            if not existing:
+                return False, f"Band {band} / Mode {mode} is not blocked"
+
             blocked_by = existing['operator_callsign']
 
             # Close the history record for the blocked operator
@@ -258,12 +256,12 @@ def admin_unblock_band_mode(band: str, mode: str, award_id: int,
         }
         if admin_callsign:
             event['callsign'] = admin_callsign.upper()
-        post_system_event_to_award_room(award_id, json.dumps(event))
+        post_system_event_to_award_room(award_id, event)
 
         return True, f"Successfully unblocked {band}/{mode} (was blocked by {blocked_by})"
-    except Exception as e:
-        print(f"Error admin unblocking band/mode: {e}")
-        return False, str(e)
+    except Exception:
+        logger.exception("Error admin unblocking band/mode")
+        return False, "An unexpected error occurred. Please try again."
 
 
 def get_all_blocks(award_id: Optional[int] = None) -> List[dict]:
@@ -285,12 +283,12 @@ def get_all_blocks(award_id: Optional[int] = None) -> List[dict]:
                 JOIN operators o ON b.operator_callsign = o.callsign
                 ORDER BY b.band, b.mode
             ''')
-        results = cursor.fetchall()
-        return [dict(row) for row in results]
+        return fetch_dicts(cursor)
 
 
 def get_operator_blocks(operator_callsign: str, award_id: Optional[int] = None) -> List[dict]:
     """Get all blocks for a specific operator, optionally filtered by award."""
+    callsign = operator_callsign.upper()
     with get_db() as conn:
         cursor = conn.cursor()
         if award_id:
@@ -298,15 +296,14 @@ def get_operator_blocks(operator_callsign: str, award_id: Optional[int] = None)
                 SELECT * FROM band_mode_blocks
                 WHERE operator_callsign = ? AND award_id = ?
                 ORDER BY band, mode
-            ''', (operator_callsign.upper(), award_id))
+            ''', (callsign, award_id))
         else:
             cursor.execute('''
                 SELECT * FROM band_mode_blocks
                 WHERE operator_callsign = ?
                 ORDER BY band, mode
-            ''', (operator_callsign.upper(),))
-        results = cursor.fetchall()
-        return [dict(row) for row in results]
+            ''', (callsign,))
+        return fetch_dicts(cursor)
 
 
 # ---------------------------------------------------------------------------
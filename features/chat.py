@@ -3,8 +3,9 @@ Chat feature module - database functions for chat message persistence, retrieval
 and chat room management.
 """
 import logging
+from datetime import datetime, timedelta, timezone
 
-from core.database import get_db
+from core.database import fetch_dicts, get_db
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +26,7 @@ def get_chat_rooms(is_admin=False):
             cursor = conn.execute(
                 "SELECT * FROM chat_rooms WHERE is_admin_only = 0 ORDER BY room_type, name"
             )
-        return [dict(row) for row in cursor.fetchall()]
+        return fetch_dicts(cursor)
 
 
 def create_chat_room(name, description='', room_type='custom',
@@ -36,14 +37,16 @@ def create_chat_room(name, description='', room_type='custom',
             cursor = conn.execute(
                 '''INSERT INTO chat_rooms (name, description, room_type, award_id,
                                           is_admin_only, created_by)
-                   VALUES (?, ?, ?, ?, ?, ?)''',
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT DO NOTHING''',
                 (name, description, room_type, award_id,
                  int(is_admin_only), created_by)
             )
+            # Nothing inserted means the name (or award) already has a room
+            if cursor.rowcount == 0:
+                return False, 'A room with that name already exists', None
             return True, 'Room created', cursor.lastrowid
-    except Exception as e:
-        if 'UNIQUE' in str(e):
-            return False, 'A room with that name already exists', None
+    except Exception:
         logger.exception("Error creating chat room")
         return False, "An unexpected error occurred. Please try again.", None
 
@@ -60,8 +63,7 @@ def delete_chat_room(room_id):
                 return False, 'Room not found'
             if row[0] == 'general':
                 return False, 'Cannot delete the General room'
-            conn.execute('DELETE FROM chat_messages WHERE room_id = ?', (room_id,))
-            conn.execute('DELETE FROM chat_notifications WHERE room_id = ?', (room_id,))
+            # Messages and notifications go with it via trg_chat_rooms_delete.
             conn.execute('DELETE FROM chat_rooms WHERE id = ?', (room_id,))
             return True, 'Room deleted'
     except Exception:
@@ -69,25 +71,62 @@ def delete_chat_room(room_id):
         return False, "An unexpected error occurred. Please try again."
 
 
+# One set-based statement creates every missing award room (mirrors
+# core.database._sync_chat_rooms, which runs at startup).
+_SQL_SYNC_AWARD_ROOMS = '''
+    INSERT OR IGNORE INTO chat_rooms (name, description, room_type, award_id)
+    SELECT a.name, '', 'award', a.id FROM awards a
+    WHERE NOT EXISTS (SELECT 1 FROM chat_rooms cr WHERE cr.award_id = a.id)
+'''
+
+
 def sync_award_rooms():
     """Ensure every active award has a corresponding chat room."""
     with get_db() as conn:
-        cursor = conn.execute('''
-            SELECT a.id, a.name FROM awards a
-            WHERE NOT EXISTS (SELECT 1 FROM chat_rooms cr WHERE cr.award_id = a.id)
-        ''')
-        for award in cursor.fetchall():
-            conn.execute(
-                "INSERT OR IGNORE INTO chat_rooms (name, description, room_type, award_id) "
-                "VALUES (?, '', 'award', ?)",
-                (award['name'], award['id'])
-            )
+        conn.execute(_SQL_SYNC_AWARD_ROOMS)
 
 
 # --- Chat messages ---
 
+_SQL_INSERT_CHAT_MESSAGE = '''
+    INSERT INTO chat_messages
+        (room_id, operator_callsign, message, source,
+         reply_to_id, reply_to_callsign, reply_to_text)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+
+_SQL_INSERT_MENTION_NOTIFICATION = '''
+    INSERT INTO chat_notifications
+        (recipient_callsign, sender_callsign, room_id,
+         message_preview, chat_message_id)
+    SELECT callsign, ?, ?, ?, ? FROM operators
+    WHERE callsign = ?
+'''
+
+
+def _insert_mention_notifications(conn, room_id, sender_callsign, message,
+                                  mentions, chat_message_id):
+    """Insert a chat_notification row for each mentioned callsign.
+
+    Mentions that are not registered operators are skipped by the
+    INSERT ... SELECT itself, so all mentions go in one executemany.
+    """
+    sender = sender_callsign.upper()
+    recipients = {c.upper() for c in mentions} - {sender}
+    if not recipients:
+        return
+    preview = message[:80] + '...' if len(message) > 80 else message
+    conn.executemany(
+        _SQL_INSERT_MENTION_NOTIFICATION,
+        [(sender, room_id, preview, chat_message_id, callsign)
+         for callsign in recipients]
+    )
+
+
 def save_chat_message(room_id, callsign, message, source='app',
-                      reply_to_id=None, reply_to_callsign=None, reply_to_text=None):
+                      reply_to_id=None, reply_to_callsign=None, reply_to_text=None,
+                      mentions=None):
     """
     Save a chat message to the database.
 
@@ -99,21 +138,28 @@ def save_chat_message(room_id, callsign, message, source='app',
         reply_to_id: ID of the message being quoted (optional)
         reply_to_callsign: Callsign of the quoted message sender (optional)
         reply_to_text: Preview text of the quoted message (optional)
+        mentions: Callsigns @mentioned in the message (optional); a
+                  notification is stored for each, in the same transaction
 
     Returns:
         int: ID of the inserted message, or None on error
     """
     try:
+        # get_db() commits on exit. The connection runs in WAL mode with
+        # synchronous=NORMAL, so that commit is a WAL append (no fsync) and
+        # does not block concurrent history readers.
         with get_db() as conn:
             cursor = conn.execute(
-                '''INSERT INTO chat_messages
-                   (room_id, operator_callsign, message, source,
-                    reply_to_id, reply_to_callsign, reply_to_text)
-                   VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                _SQL_INSERT_CHAT_MESSAGE,
                 (room_id, callsign, message, source,
                  reply_to_id, reply_to_callsign, reply_to_text)
             )
-            return cursor.lastrowid
+            message_id = cursor.lastrowid
+            if mentions:
+                _insert_mention_notifications(
+                    conn, room_id, callsign, message, mentions, message_id
+                )
+            return message_id
     except Exception:
         logger.exception("Failed to save chat message")
         return None
@@ -137,8 +183,23 @@ def get_chat_history(award_id, limit=100):
                ORDER BY created_at ASC''',
             (award_id, limit)
         )
-        return [dict(row) for row in cursor.fetchall()]
-
+        return fetch_dicts(cursor)
+
+
+# The inner query is a backwards walk of idx_chat_messages_room
+# (room_id, created_at) that stops after LIMIT rows; only those rows are
+# re-sorted oldest-first.
+_SQL_SELECT_ROOM_HISTORY = '''
+    SELECT * FROM (
+        SELECT id, room_id, operator_callsign, message, source, created_at,
+               reply_to_id, reply_to_callsign, reply_to_text
+        FROM chat_messages
+        WHERE room_id = ?
+        ORDER BY created_at DESC
+        LIMIT ?
+    ) sub
+    ORDER BY created_at ASC
+'''
 
 def get_chat_history_by_room(room_id, limit=100):
     """
@@ -152,19 +213,7 @@ def get_chat_history_by_room(room_id, limit=100):
         list: Messages as dicts, oldest first
     """
     with get_db() as conn:
-        cursor = conn.execute(
-            '''SELECT * FROM (
-                   SELECT id, room_id, operator_callsign, message, source, created_at,
-                          reply_to_id, reply_to_callsign, reply_to_text
-                   FROM chat_messages
-                   WHERE room_id = ?
-                   ORDER BY created_at DESC
-                   LIMIT ?
-               ) sub
-               ORDER BY created_at ASC''',
-            (room_id, limit)
-        )
-        return [dict(row) for row in cursor.fetchall()]
+        return fetch_dicts(conn.execute(_SQL_SELECT_ROOM_HISTORY, (room_id, limit)))
 
 
 def get_chat_history_global(limit=100):
@@ -181,7 +230,7 @@ def get_chat_history_global(limit=100):
                ORDER BY created_at ASC''',
             (limit,)
         )
-        return [dict(row) for row in cursor.fetchall()]
+        return fetch_dicts(cursor)
 
 
 def get_chat_histories_by_rooms(room_ids, limit=100):
@@ -195,19 +244,9 @@ def get_chat_histories_by_rooms(room_ids, limit=100):
         return histories
     with get_db() as conn:
         for room_id in room_ids:
-            cursor = conn.execute(
-                '''SELECT * FROM (
-                       SELECT id, room_id, operator_callsign, message, source, created_at,
-                              reply_to_id, reply_to_callsign, reply_to_text
-                       FROM chat_messages
-                       WHERE room_id = ?
-                       ORDER BY created_at DESC
-                       LIMIT ?
-                   ) sub
-                   ORDER BY created_at ASC''',
-                (room_id, limit)
+            histories[room_id] = fetch_dicts(
+                conn.execute(_SQL_SELECT_ROOM_HISTORY, (room_id, limit))
             )
-            histories[room_id] = [dict(row) for row in cursor.fetchall()]
     return histories
 
 
@@ -216,22 +255,28 @@ def get_chat_stats():
     Return chat statistics: total count, per-room breakdown.
     """
     with get_db() as conn:
-        cursor = conn.execute('SELECT COUNT(*) FROM chat_messages')
-        total = cursor.fetchone()[0]
-
+        # Aggregate first (a single pass over idx_chat_messages_room), then
+        # join the room name once per group rather than once per message.
         cursor = conn.execute(
-            '''SELECT cm.room_id,
+            '''SELECT t.room_id,
                       cr.name AS room_name,
-                      COUNT(*) AS message_count,
-                      MIN(cm.created_at) AS oldest,
-                      MAX(cm.created_at) AS newest
-               FROM chat_messages cm
-               LEFT JOIN chat_rooms cr ON cr.id = cm.room_id
-               GROUP BY cm.room_id
-               ORDER BY message_count DESC'''
+                      t.message_count,
+                      t.oldest,
+                      t.newest
+               FROM (SELECT room_id,
+                            COUNT(*) AS message_count,
+                            MIN(created_at) AS oldest,
+                            MAX(created_at) AS newest
+                     FROM chat_messages
+                     GROUP BY room_id) t
+               LEFT JOIN chat_rooms cr ON cr.id = t.room_id
+               ORDER BY t.message_count DESC'''
         )
         per_room = [dict(row) for row in cursor.fetchall()]
-        return {'total': total, 'per_room': per_room}
+    # Every message falls in exactly one group (NULL room_id included), so
+    # the total comes from the same pass instead of a second COUNT(*) scan.
+    total = sum(room['message_count'] for room in per_room)
+    return {'total': total, 'per_room': per_room}
 
 
 def get_chat_stats_by_user():
@@ -249,6 +294,9 @@ def get_chat_stats_by_user():
         return [dict(row) for row in cursor.fetchall()]
 
 
+_CHAT_DELETE_BATCH = 10000
+
+
 def delete_chat_messages_by_room(room_id):
     """Delete all chat messages for a specific room. Returns number of rows deleted."""
     with get_db() as conn:
@@ -271,22 +319,34 @@ def delete_chat_messages_older_than(days, room_id=None):
     """
     Delete messages older than `days` days, optionally filtered by room.
     Returns number of rows deleted.
+
+    Rows are removed in batches of _CHAT_DELETE_BATCH, each committed on
+    its own, so a large purge never builds one huge WAL transaction or
+    holds the write lock for long.
     """
-    with get_db() as conn:
-        if room_id is not None:
-            cursor = conn.execute(
-                '''DELETE FROM chat_messages
-                   WHERE created_at < datetime('now', ? || ' days')
-                   AND room_id = ?''',
-                (f'-{days}', room_id)
-            )
-        else:
-            cursor = conn.execute(
-                '''DELETE FROM chat_messages
-                   WHERE created_at < datetime('now', ? || ' days')''',
-                (f'-{days}',)
-            )
-        return cursor.rowcount
+    # Computed once, in CURRENT_TIMESTAMP's format, so every batch uses the
+    # same cutoff and the comparison is a plain text range on created_at.
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+    if room_id is not None:
+        sql = '''DELETE FROM chat_messages WHERE id IN (
+                     SELECT id FROM chat_messages
+                     WHERE created_at < ? AND room_id = ?
+                     LIMIT ?)'''
+        params = (cutoff, room_id, _CHAT_DELETE_BATCH)
+    else:
+        sql = '''DELETE FROM chat_messages WHERE id IN (
+                     SELECT id FROM chat_messages
+                     WHERE created_at < ?
+                     LIMIT ?)'''
+        params = (cutoff, _CHAT_DELETE_BATCH)
+
+    deleted = 0
+    while True:
+        with get_db() as conn:
+            batch = conn.execute(sql, params).rowcount
+        deleted += batch
+        if batch < _CHAT_DELETE_BATCH:
+            return deleted
 
 
 def delete_all_chat_messages():
@@ -310,6 +370,8 @@ def get_unread_chat_notification_count(operator_callsign):
 
 def get_unread_chat_notifications(operator_callsign, limit=20):
     """Return unread chat mention notifications for an operator."""
+    # Served newest-first straight from idx_chat_notifications_recipient
+    # (recipient_callsign, is_read, created_at), with no sort step.
     with get_db() as conn:
         cursor = conn.execute(
             '''SELECT cn.id, cn.sender_callsign, cn.room_id, cn.message_preview,
@@ -321,7 +383,7 @@ def get_unread_chat_notifications(operator_callsign, limit=20):
                LIMIT ?''',
             (operator_callsign.upper(), limit)
         )
-        return [dict(row) for row in cursor.fetchall()]
+        return fetch_dicts(cursor)
 
 
 def mark_chat_notification_read(notification_id):
@@ -6,15 +6,23 @@ Sends spots to DX Cluster nodes via Telnet to announce special callsign activity
 
 import concurrent.futures
 import logging
+import re
+import selectors
 import socket
 import time
 from typing import Tuple, List, Optional
 
 from core.database import get_db
+from core.validation import is_valid_callsign
 
 logger = logging.getLogger(__name__)
 
 
+# CR/LF (or any control character) in a comment would start a new cluster
+# command, so they are replaced with spaces.
+_CONTROL_CHARS_RE = re.compile(r'[\x00-\x1f\x7f]')
+
+
 # Dedicated executor so telnet I/O (up to 15 seconds) never blocks the Streamlit
 # script thread. Small pool - only one or two spots typically fly at a time.
 _spot_executor = concurrent.futures.ThreadPoolExecutor(
@@ -83,6 +91,14 @@ def send_spot_to_cluster(
     if frequency <= 0:
         return False, "Frequency must be greater than 0"
 
+    spotted_callsign = spotted_callsign.strip().upper()
+    # Callsigns are written verbatim into the telnet session, so they are
+    # checked before anything is sent.
+    if not is_valid_callsign(spotted_callsign):
+        return False, "Invalid spotted callsign"
+    if not is_valid_callsign(login_callsign, allow_ssid=True):
+        return False, "Invalid cluster login callsign"
+
     sock = None
     try:
         # Connect to the cluster
@@ -115,7 +131,7 @@ def send_spot_to_cluster(
 
         # Build and send the DX spot command
         # Format: DX <frequency> <callsign> <comment>
-        comment_clean = comment[:30].strip() if comment else ""
+        comment_clean = _CONTROL_CHARS_RE.sub(" ", comment[:30]).strip() if comment else ""
         spot_cmd = f"DX {frequency:.1f} {spotted_callsign} {comment_clean}\r\n"
         sock.sendall(spot_cmd.encode("ascii"))
 
@@ -145,22 +161,41 @@ def send_spot_to_cluster(
                 pass
 
 
+# Cluster nodes end each reply with a prompt: "login:", "Please enter your
+# call:", "password:" or a node prompt such as "EA1ABC de EA4URE-2 ... >".
+# Only spaces and BEL characters may follow it: a line that ends in ':' or
+# '>' and then CR/LF ("Rules:", "<html>") is banner text, not a prompt.
+_PROMPT_RE = re.compile(rb'[>#:][ \x07]*$')
+
+# Once some output has arrived, this much silence also ends the read, for
+# nodes whose prompt does not match _PROMPT_RE.
+_READ_IDLE_GAP = 0.3
+
+
 def _read_until_prompt(sock: socket.socket, timeout: int = 10) -> str:
-    """Read data from socket until no more data arrives (simple approach)."""
-    sock.settimeout(min(timeout, 5))
-    data = b""
-    try:
+    """Read from the socket until the node shows a prompt.
+
+    Returns as soon as the buffered output ends in a prompt, or after
+    _READ_IDLE_GAP seconds of silence following some output. Waits at most
+    min(timeout, 5) seconds overall.
+    """
+    buf = bytearray()
+    deadline = time.monotonic() + min(timeout, 5)
+    with selectors.DefaultSelector() as selector:
+        selector.register(sock, selectors.EVENT_READ)
         while True:
+            wait = deadline - time.monotonic()
+            if buf:
+                wait = min(wait, _READ_IDLE_GAP)
+            if wait <= 0 or not selector.select(wait):
+                break
             chunk = sock.recv(4096)
             if not chunk:
                 break
-            data += chunk
-            # Brief pause to allow more data to arrive
-            time.sleep(0.3)
-            sock.settimeout(1)
-    except socket.timeout:
-        pass
-    return data.decode("ascii", errors="replace")
+            buf += chunk
+            if _PROMPT_RE.search(buf[-64:]):
+                break
+    return buf.decode("ascii", errors="replace")
 
 
 # ---------------------------------------------------------------------------
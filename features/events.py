@@ -5,10 +5,13 @@ Used by block/unblock operations to notify room participants in real-time.
 If MQTT is not configured, messages are still persisted to the database.
 """
 
+import atexit
 import json
 import logging
 import os
+import threading
 from datetime import datetime, timezone
+from typing import Any, Dict
 
 from core.database import get_db
 
@@ -17,12 +20,19 @@ logger = logging.getLogger(__name__)
 MQTT_BROKER_HOST = os.getenv('MQTT_BROKER_HOST', 'mosquitto')
 MQTT_BROKER_PORT = int(os.getenv('MQTT_BROKER_PORT', '1883'))
 
+# Event JSON is only ever machine-read (chat widget, Telegram bot), so it is
+# serialized without the default ', ' / ': ' padding.
+_JSON_SEPARATORS = (',', ':')
 
-def post_system_event_to_award_room(award_id: int, message_text: str) -> None:
+
+def post_system_event_to_award_room(award_id: int, event: Dict[str, Any]) -> None:
     """
     Persist a system event message to the chat room linked to the given award,
     then publish it via MQTT so connected clients see it in real-time.
 
+    The event dict is only serialized once a linked room has been found, so
+    awards without a chat room pay for a single indexed lookup.
+
     Silently no-ops if the award has no linked chat room or MQTT is unavailable.
     """
     try:
@@ -35,6 +45,7 @@ def post_system_event_to_award_room(award_id: int, message_text: str) -> None:
             if not row:
                 return
             room_id = row['id']
+            message_text = json.dumps(event, separators=_JSON_SEPARATORS)
 
             conn.execute(
                 '''INSERT INTO chat_messages (room_id, operator_callsign, message, source)
@@ -49,10 +60,44 @@ def post_system_event_to_award_room(award_id: int, message_text: str) -> None:
         logger.warning("post_system_event_to_award_room failed", exc_info=True)
 
 
+# One long-lived publisher per process. paho's network thread (loop_start)
+# keeps the session alive and reconnects, so each event is just an enqueue
+# instead of a CONNECT/PUBLISH/DISCONNECT round trip.
+_mqtt_client = None
+_mqtt_lock = threading.Lock()
+
+
+def _get_mqtt_client():
+    """Return the shared MQTT client, creating it on first use.
+
+    The TCP connect happens on paho's network thread (connect_async), so
+    neither the lock holder nor any other publisher waits on the broker.
+    While it is unreachable, publishes are dropped and the loop keeps
+    retrying with backoff.
+    """
+    global _mqtt_client
+    with _mqtt_lock:
+        if _mqtt_client is None:
+            import paho.mqtt.client as mqtt
+            client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
+            client.connect_async(MQTT_BROKER_HOST, MQTT_BROKER_PORT, keepalive=60)
+            client.loop_start()
+            _mqtt_client = client
+        return _mqtt_client
+
+
+@atexit.register
+def _close_mqtt_client() -> None:
+    if _mqtt_client is not None:
+        # Disconnect first so the network loop still runs to flush the
+        # DISCONNECT packet, then stop the loop thread.
+        _mqtt_client.disconnect()
+        _mqtt_client.loop_stop()
+
+
 def _publish_system_mqtt(room_id: int, message_text: str) -> None:
     """Publish a system message to the MQTT broker (best-effort)."""
     try:
-        import paho.mqtt.publish as mqtt_publish
         topic = f'quendaward/chat/room/{room_id}'
         ts = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
         payload = json.dumps({
@@ -60,7 +105,7 @@ def _publish_system_mqtt(room_id: int, message_text: str) -> None:
             'message': message_text,
             'source': 'system',
             'timestamp': ts,
-        })
-        mqtt_publish.single(topic, payload, hostname=MQTT_BROKER_HOST, port=MQTT_BROKER_PORT)
+        }, separators=_JSON_SEPARATORS)
+        _get_mqtt_client().publish(topic, payload)
     except Exception:
         logger.debug("MQTT publish for system event failed (non-critical)", exc_info=True)
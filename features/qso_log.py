@@ -9,12 +9,13 @@ The upload path is designed to stay fast on mobile:
     script thread is not blocked while the browser tab waits
 """
 
+import bisect
 import concurrent.futures
 import logging
 from datetime import datetime
 from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-from core.database import get_db
+from core.database import fetch_dicts, get_db
 
 logger = logging.getLogger(__name__)
 
@@ -37,16 +38,20 @@ _ingest_executor = concurrent.futures.ThreadPoolExecutor(
 MAX_ADIF_UPLOAD_BYTES = 10 * 1024 * 1024  # 10 MB ~= 50k QSOs
 
 # Columns that the bulk insert populates - order matters for executemany.
-_QSO_COLUMNS = (
-    "award_id", "operator_callsign", "batch_id",
+# The first three are the same for every QSO in an upload; _normalize_qso
+# only produces the per-record part so parsed rows stay small in memory.
+_QSO_UPLOAD_COLUMNS = ("award_id", "operator_callsign", "batch_id")
+_QSO_RECORD_COLUMNS = (
     "call", "band", "mode", "qso_date", "time_on",
     "rst_sent", "rst_rcvd", "freq",
     "name", "qth", "gridsquare", "comment",
 )
+_QSO_COLUMNS = _QSO_UPLOAD_COLUMNS + _QSO_RECORD_COLUMNS
 
 # Fallback band/frequency table used when the ADIF only carries freq or band.
 # Values are frequency-range -> band. Matches the bands declared in config.py.
-_BAND_RANGES = [
+# Kept as an immutable tuple built once at import; it is scanned per record.
+_BAND_RANGES = (
     (1.8,    2.0,     "160m"),
     (3.5,    4.0,     "80m"),
     (5.3,    5.5,     "60m"),
@@ -61,7 +66,16 @@ _BAND_RANGES = [
     (50.0,   54.0,    "6m"),
     (144.0,  148.0,   "2m"),
     (420.0,  450.0,   "70cm"),
-]
+)
+
+# ADIF MODE values whose SUBMODE names the actual protocol (e.g. DATA/FT8).
+_SUBMODE_PARENT_MODES = frozenset(("DATA", "DIGITAL", "MFSK", "PSK", "RTTY"))
+
+# Flattened, sorted band edges [lo0, hi0, lo1, hi1, ...] for a bisect lookup.
+# An even slot index means the frequency is inside band index // 2; an odd
+# slot is the gap after that band (unless it sits exactly on the upper edge).
+_BAND_EDGES = tuple(edge for lo, hi, _ in _BAND_RANGES for edge in (lo, hi))
+_BAND_LABELS = tuple(label for _, _, label in _BAND_RANGES)
 
 
 # ---------------------------------------------------------------------------
@@ -80,13 +94,14 @@ def parse_adif_stream(text: str) -> Iterator[Dict[str, str]]:
     # ADIF files may start with a free-form header terminated by <eoh>.
     # Everything before <eoh> is metadata we don't need. Do a case-insensitive
     # scan so we correctly strip the header regardless of tag casing.
+    # The folded copy is made once and shared with _split_records; the body
+    # is addressed by offset rather than sliced, so no further full-size
+    # copies of an upload are made.
     lower = text.lower()
     header_end = lower.find("<eoh>")
-    if header_end >= 0:
-        text = text[header_end + 5:]
+    start = header_end + 5 if header_end >= 0 else 0
 
-    # Split on EOR. Case-insensitive by folding text once for lookup.
-    records = _split_records(text)
+    records = _split_records(text, lower, start)
     for raw in records:
         fields = _scan_record(raw)
         if not fields:
@@ -94,16 +109,20 @@ def parse_adif_stream(text: str) -> Iterator[Dict[str, str]]:
         yield fields
 
 
-def _split_records(text: str) -> Iterator[str]:
-    """Yield raw record strings split on <eor>, case-insensitive."""
-    lower = text.lower()
-    start = 0
+def _split_records(text: str, lower: str, start: int = 0) -> Iterator[str]:
+    """Yield raw record strings split on <eor>, case-insensitive.
+
+    ``lower`` is ``text.lower()``, used only to find the markers; records
+    are sliced from ``text`` beginning at offset ``start``.
+    """
     while True:
         idx = lower.find("<eor>", start)
         if idx < 0:
-            remainder = text[start:].strip()
-            if remainder:
-                yield remainder
+            # Files usually end with "<eor>\n", leaving only whitespace here.
+            # A tail without any "<" cannot hold a field, so skip it without
+            # copying the remainder.
+            if text.find("<", start) >= 0:
+                yield text[start:]
             return
         yield text[start:idx]
         start = idx + 5
@@ -147,25 +166,50 @@ def _scan_record(raw: str) -> Dict[str, str]:
     return fields
 
 
-def _normalize_qso(
-    raw: Dict[str, str],
-    award_id: int,
-    operator: str,
-    batch_id: Optional[int],
-) -> Optional[Tuple]:
-    """Turn a raw ADIF dict into a tuple ready for executemany.
+def _normalize_qso(raw: Dict[str, str]) -> Optional[Tuple]:
+    """Turn a raw ADIF dict into the per-record part of an insert row.
 
     Returns None if the record is missing required fields.
-    Returned tuple ordering must match _QSO_COLUMNS.
+    Returned tuple ordering must match _QSO_RECORD_COLUMNS.
+
+    Runs once per QSO on uploads of up to ~50k records, so lookups are bound
+    to locals and required fields are checked before any optional work.
     """
-    call = (raw.get("call") or "").strip().upper()
+    get = raw.get
+
+    call = get("call")
     if not call:
         return None
+    call = call.strip().upper()
+    if not call:
+        return None
+
+    mode = get("mode")
+    if not mode:
+        return None
+    mode = mode.strip().upper()
+    if not mode:
+        return None
+
+    qso_date = get("qso_date")
+    if not qso_date:
+        return None
+    qso_date = qso_date.strip()
+    if len(qso_date) != 8 or not qso_date.isdigit():
+        return None
+
+    time_on_raw = get("time_on")
+    if not time_on_raw:
+        return None
+    time_on_raw = time_on_raw.strip()
+    if len(time_on_raw) < 4 or not time_on_raw.isdigit():
+        return None
 
     # Derive band either from explicit tag or from freq.
-    band = (raw.get("band") or "").strip().lower()
+    band = get("band")
+    band = band.strip().lower() if band else ""
     freq_val: Optional[float] = None
-    freq_raw = raw.get("freq") or raw.get("freq_rx")
+    freq_raw = get("freq") or get("freq_rx")
     if freq_raw:
         try:
             freq_val = float(freq_raw)
@@ -176,45 +220,46 @@ def _normalize_qso(
     if not band:
         return None
 
-    mode = (raw.get("mode") or "").strip().upper()
-    if not mode:
-        return None
     # ADIF sometimes uses SUBMODE for digital; prefer submode when present for
     # common digital modes where SUBMODE is the specific protocol.
-    submode = (raw.get("submode") or "").strip().upper()
-    if submode and mode in ("DATA", "DIGITAL", "MFSK", "PSK", "RTTY"):
-        mode = submode
-
-    qso_date = (raw.get("qso_date") or "").strip()
-    if not qso_date or len(qso_date) != 8 or not qso_date.isdigit():
-        return None
-    qso_date = f"{qso_date[:4]}-{qso_date[4:6]}-{qso_date[6:]}"
-
-    time_on_raw = (raw.get("time_on") or "").strip()
-    if not time_on_raw or not time_on_raw.isdigit() or len(time_on_raw) < 4:
-        return None
-    time_on = f"{time_on_raw[:2]}:{time_on_raw[2:4]}"
-
-    rst_sent = (raw.get("rst_sent") or "").strip() or None
-    rst_rcvd = (raw.get("rst_rcvd") or "").strip() or None
-    name = (raw.get("name") or "").strip() or None
-    qth = (raw.get("qth") or "").strip() or None
-    grid = (raw.get("gridsquare") or "").strip().upper() or None
-    comment = (raw.get("comment") or raw.get("notes") or "").strip() or None
+    if mode in _SUBMODE_PARENT_MODES:
+        submode = get("submode")
+        if submode:
+            submode = submode.strip().upper()
+            if submode:
+                mode = submode
+
+    rst_sent = get("rst_sent")
+    rst_rcvd = get("rst_rcvd")
+    name = get("name")
+    qth = get("qth")
+    grid = get("gridsquare")
+    comment = get("comment") or get("notes")
 
     return (
-        award_id, operator.upper(), batch_id,
-        call, band, mode, qso_date, time_on,
-        rst_sent, rst_rcvd, freq_val,
-        name, qth, grid, comment,
+        call, band, mode,
+        f"{qso_date[:4]}-{qso_date[4:6]}-{qso_date[6:]}",
+        f"{time_on_raw[:2]}:{time_on_raw[2:4]}",
+        (rst_sent.strip() or None) if rst_sent else None,
+        (rst_rcvd.strip() or None) if rst_rcvd else None,
+        freq_val,
+        (name.strip() or None) if name else None,
+        (qth.strip() or None) if qth else None,
+        (grid.strip().upper() or None) if grid else None,
+        (comment.strip() or None) if comment else None,
     )
 
 
 def _band_from_freq(freq_mhz: float) -> Optional[str]:
     """Map an ADIF freq value in MHz to our band label, if it falls in any."""
-    for lo, hi, label in _BAND_RANGES:
-        if lo <= freq_mhz <= hi:
-            return label
+    i = bisect.bisect_right(_BAND_EDGES, freq_mhz) - 1
+    if i < 0:
+        return None
+    if i % 2 == 0:
+        return _BAND_LABELS[i // 2]
+    # Band ranges are inclusive of their upper edge.
+    if freq_mhz == _BAND_EDGES[i]:
+        return _BAND_LABELS[i // 2]
     return None
 
 
@@ -266,22 +311,22 @@ def ingest_adif_bytes(
     except UnicodeDecodeError:
         text = file_bytes.decode("ascii", errors="replace")
 
-    _INGEST_BATCH_SIZE = 500
-
     # First pass: parse + normalize into a flat list.
     parsed_rows: List[Tuple] = []
     parsed_total = 0
     errors = 0
     for raw in parse_adif_stream(text):
         parsed_total += 1
-        row = _normalize_qso(raw, award_id, operator_callsign, batch_id=None)
+        row = _normalize_qso(raw)
         if row is None:
             errors += 1
             continue
         parsed_rows.append(row)
 
     # Second pass: open a write transaction, create the batch row so we can
-    # tag each QSO with it, then insert in chunks to bound peak memory.
+    # tag each QSO with it, then stream the rows into executemany. Each insert
+    # row is built with a single tuple concat as sqlite3 consumes it, so no
+    # second full-size list is materialized.
     # INSERT OR IGNORE silently drops duplicates caught by idx_qso_dedup.
     batch_id: Optional[int] = None
     inserted = 0
@@ -303,13 +348,9 @@ def ingest_adif_bytes(
                 VALUES ({", ".join("?" * len(_QSO_COLUMNS))})'''
         )
 
-        for i in range(0, len(parsed_rows), _INGEST_BATCH_SIZE):
-            chunk = [
-                (r[0], r[1], batch_id) + r[3:]
-                for r in parsed_rows[i:i + _INGEST_BATCH_SIZE]
-            ]
-            cursor.executemany(insert_sql, chunk)
-            inserted += cursor.rowcount
+        prefix = (award_id, operator_callsign.upper(), batch_id)
+        cursor.executemany(insert_sql, (prefix + r for r in parsed_rows))
+        inserted = cursor.rowcount
 
         duplicates = len(parsed_rows) - inserted
         cursor.execute(
@@ -338,55 +379,56 @@ def ingest_adif_bytes(
 # Queries
 # ---------------------------------------------------------------------------
 
+def _by_count_desc(counts: Dict[str, int]) -> Dict[str, int]:
+    """Reorder a histogram largest-first, like ORDER BY COUNT(*) DESC."""
+    return dict(sorted(counts.items(), key=lambda kv: kv[1], reverse=True))
+
+
 def get_qso_stats(award_id: int, operator_callsign: Optional[str] = None) -> Dict:
     """Get total / by-band / by-mode / unique-call counts for an award.
 
     Passing operator_callsign scopes everything to that operator.
     """
+    base = "FROM qso_log WHERE award_id = ?"
+    params: List = [award_id]
+    if operator_callsign:
+        base += " AND operator_callsign = ?"
+        params.append(operator_callsign.upper())
+
+    # A single band x mode grouping yields both histograms and the total,
+    # replacing three separate scans (COUNT(*), GROUP BY band, GROUP BY mode).
+    by_band: Dict[str, int] = {}
+    by_mode: Dict[str, int] = {}
+    total = 0
+    by_operator: Dict[str, int] = {}
     with get_db() as conn:
-        c = conn.cursor()
-        base = "FROM qso_log WHERE award_id = ?"
-        params: List = [award_id]
-        if operator_callsign:
-            base += " AND operator_callsign = ?"
-            params.append(operator_callsign.upper())
-
-        total = c.execute(f"SELECT COUNT(*) {base}", params).fetchone()[0]
-        unique_calls = c.execute(
+        for band, mode, n in conn.execute(
+            f"SELECT band, mode, COUNT(*) {base} GROUP BY band, mode", params
+        ):
+            by_band[band] = by_band.get(band, 0) + n
+            by_mode[mode] = by_mode.get(mode, 0) + n
+            total += n
+        unique_calls = conn.execute(
             f"SELECT COUNT(DISTINCT call) {base}", params
         ).fetchone()[0]
-        by_band = {
-            row[0]: row[1]
-            for row in c.execute(
-                f"SELECT band, COUNT(*) {base} GROUP BY band ORDER BY 2 DESC",
-                params,
-            )
-        }
-        by_mode = {
-            row[0]: row[1]
-            for row in c.execute(
-                f"SELECT mode, COUNT(*) {base} GROUP BY mode ORDER BY 2 DESC",
-                params,
-            )
-        }
-        by_operator: Dict[str, int] = {}
         if not operator_callsign:
             by_operator = {
                 row[0]: row[1]
-                for row in c.execute(
+                for row in conn.execute(
                     "SELECT operator_callsign, COUNT(*) FROM qso_log "
                     "WHERE award_id = ? GROUP BY operator_callsign "
                     "ORDER BY 2 DESC",
                     [award_id],
                 )
             }
-        return {
-            "total": total,
-            "unique_calls": unique_calls,
-            "by_band": by_band,
-            "by_mode": by_mode,
-            "by_operator": by_operator,
-        }
+
+    return {
+        "total": total,
+        "unique_calls": unique_calls,
+        "by_band": _by_count_desc(by_band),
+        "by_mode": _by_count_desc(by_mode),
+        "by_operator": by_operator,
+    }
 
 
 def get_qsos_by_date(
@@ -443,18 +485,13 @@ def get_qsos_band_mode_matrix(
         return [{"band": r[0], "mode": r[1], "count": r[2]} for r in rows]
 
 
-def get_qsos_page(
+def _qso_filter(
     award_id: int,
-    operator_callsign: Optional[str] = None,
-    limit: int = 50,
-    offset: int = 0,
-    band: Optional[str] = None,
-    mode: Optional[str] = None,
-) -> List[dict]:
-    """Paginated QSO view for an award, most-recent first.
-
-    `operator_callsign=None` returns everyone's QSOs (admin view).
-    """
+    operator_callsign: Optional[str],
+    band: Optional[str],
+    mode: Optional[str],
+) -> Tuple[str, List]:
+    """WHERE clause and params shared by the QSO list, count and export."""
     where = "WHERE award_id = ?"
     params: List = [award_id]
     if operator_callsign:
@@ -466,6 +503,22 @@ def get_qsos_page(
     if mode:
         where += " AND mode = ?"
         params.append(mode)
+    return where, params
+
+
+def get_qsos_page(
+    award_id: int,
+    operator_callsign: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0,
+    band: Optional[str] = None,
+    mode: Optional[str] = None,
+) -> List[dict]:
+    """Paginated QSO view for an award, most-recent first.
+
+    `operator_callsign=None` returns everyone's QSOs (admin view).
+    """
+    where, params = _qso_filter(award_id, operator_callsign, band, mode)
     params.extend([limit, offset])
 
     with get_db() as conn:
@@ -475,7 +528,7 @@ def get_qsos_page(
                 LIMIT ? OFFSET ?""",
             params,
         )
-        return [dict(row) for row in cursor.fetchall()]
+        return fetch_dicts(cursor)
 
 
 def count_qsos(
@@ -485,17 +538,7 @@ def count_qsos(
     mode: Optional[str] = None,
 ) -> int:
     """Return the total number of QSOs matching the filters (for pagination)."""
-    where = "WHERE award_id = ?"
-    params: List = [award_id]
-    if operator_callsign:
-        where += " AND operator_callsign = ?"
-        params.append(operator_callsign.upper())
-    if band:
-        where += " AND band = ?"
-        params.append(band)
-    if mode:
-        where += " AND mode = ?"
-        params.append(mode)
+    where, params = _qso_filter(award_id, operator_callsign, band, mode)
     with get_db() as conn:
         row = conn.execute(
             f"SELECT COUNT(*) FROM qso_log {where}", params
@@ -521,7 +564,7 @@ def get_upload_batches(
                 ORDER BY uploaded_at DESC, id DESC LIMIT ?""",
             params,
         )
-        return [dict(row) for row in cursor.fetchall()]
+        return fetch_dicts(cursor)
 
 
 def delete_batch(
@@ -582,46 +625,93 @@ def export_qsos_to_adif(
 ) -> str:
     """Format a list of QSO rows as a valid ADIF 3.1.4 document."""
     now = datetime.utcnow().strftime("%Y%m%d %H%M%S")
-    lines = [
-        f"ADIF export from QuendAward - {now}",
-        "<adif_ver:5>3.1.4",
-        "<programid:10>QuendAward",
-        f"<programversion:{len(program_version)}>{program_version}",
-        "<eoh>",
-        "",
+    out = [
+        f"ADIF export from QuendAward - {now}\n"
+        "<adif_ver:5>3.1.4\n"
+        "<programid:10>QuendAward\n"
+        f"<programversion:{len(program_version)}>{program_version}\n"
+        "<eoh>\n"
+        "\n"
     ]
+    # Fields are written straight into one output list (no per-record list
+    # or per-field helper call); the constant station field is built once.
+    station = _adif_field("station_callsign", station_callsign) if station_callsign else ""
+    append = out.append
     for q in qsos:
-        record: List[str] = []
-        record.append(_adif_field("call", q.get("call")))
-        record.append(_adif_field("band", q.get("band")))
-        record.append(_adif_field("mode", q.get("mode")))
-
-        qdate = (q.get("qso_date") or "").replace("-", "")
-        if qdate:
-            record.append(_adif_field("qso_date", qdate))
-        ton = (q.get("time_on") or "").replace(":", "")
-        if ton:
-            record.append(_adif_field("time_on", ton))
-
-        if q.get("rst_sent"):
-            record.append(_adif_field("rst_sent", q["rst_sent"]))
-        if q.get("rst_rcvd"):
-            record.append(_adif_field("rst_rcvd", q["rst_rcvd"]))
-        if q.get("freq") is not None:
-            record.append(_adif_field("freq", f"{float(q['freq']):.5f}".rstrip("0").rstrip(".")))
-        if q.get("name"):
-            record.append(_adif_field("name", q["name"]))
-        if q.get("qth"):
-            record.append(_adif_field("qth", q["qth"]))
-        if q.get("gridsquare"):
-            record.append(_adif_field("gridsquare", q["gridsquare"]))
-        if q.get("comment"):
-            record.append(_adif_field("comment", q["comment"]))
-        if station_callsign:
-            record.append(_adif_field("station_callsign", station_callsign))
-        if q.get("operator_callsign"):
-            record.append(_adif_field("operator", q["operator_callsign"]))
-
-        record.append("<eor>")
-        lines.append("".join(r for r in record if r))
-    return "\n".join(lines) + "\n"
+        get = q.get
+        for key in ("call", "band", "mode"):
+            v = get(key)
+            if v is not None:
+                v = str(v)
+                append(f"<{key}:{len(v)}>{v}")
+
+        v = get("qso_date")
+        if v:
+            v = v.replace("-", "")
+            if v:
+                append(f"<qso_date:{len(v)}>{v}")
+        v = get("time_on")
+        if v:
+            v = v.replace(":", "")
+            if v:
+                append(f"<time_on:{len(v)}>{v}")
+
+        for key in ("rst_sent", "rst_rcvd"):
+            v = get(key)
+            if v:
+                v = str(v)
+                append(f"<{key}:{len(v)}>{v}")
+        v = get("freq")
+        if v is not None:
+            v = f"{float(v):.5f}".rstrip("0").rstrip(".")
+            append(f"<freq:{len(v)}>{v}")
+        for key in ("name", "qth", "gridsquare", "comment"):
+            v = get(key)
+            if v:
+                v = str(v)
+                append(f"<{key}:{len(v)}>{v}")
+
+        if station:
+            append(station)
+        v = get("operator_callsign")
+        if v:
+            v = str(v)
+            append(f"<operator:{len(v)}>{v}")
+        append("<eor>\n")
+    return "".join(out)
+
+
+# Columns export_qsos_to_adif reads; the export query selects only these.
+_ADIF_EXPORT_COLUMNS = (
+    "call", "band", "mode", "qso_date", "time_on", "rst_sent", "rst_rcvd",
+    "freq", "name", "qth", "gridsquare", "comment", "operator_callsign",
+)
+
+
+def export_award_qsos_to_adif(
+    award_id: int,
+    operator_callsign: Optional[str] = None,
+    band: Optional[str] = None,
+    mode: Optional[str] = None,
+    station_callsign: str = "",
+    limit: int = 50000,
+) -> str:
+    """Export the QSOs matching the filters as ADIF, most-recent first.
+
+    Same filters and order as get_qsos_page, but rows are fed from the
+    cursor into export_qsos_to_adif one at a time, so the export never holds
+    a full list of QSO dicts alongside the generated text.
+    """
+    where, params = _qso_filter(award_id, operator_callsign, band, mode)
+    params.append(limit)
+    with get_db() as conn:
+        cursor = conn.execute(
+            f"""SELECT {", ".join(_ADIF_EXPORT_COLUMNS)} FROM qso_log {where}
+                ORDER BY qso_date DESC, time_on DESC, id DESC
+                LIMIT ?""",
+            params,
+        )
+        return export_qsos_to_adif(
+            (dict(zip(_ADIF_EXPORT_COLUMNS, row)) for row in cursor),
+            station_callsign=station_callsign,
+        )
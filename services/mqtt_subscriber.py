@@ -9,52 +9,22 @@ Can run as a background thread within the Streamlit app or standalone.
 
 import json
 import logging
-import re
 import threading
 
 import paho.mqtt.client as mqtt
 
 from config import MQTT_BROKER_HOST, MQTT_BROKER_PORT, MAX_CHAT_MESSAGE_LENGTH
 from core.database import get_db
+from core.validation import is_valid_callsign
 from features.chat import save_chat_message
 
 logger = logging.getLogger(__name__)
 
-# Callsign format: 2-20 alphanumeric chars, may include /
-_CALLSIGN_RE = re.compile(r'^[A-Z0-9/]{2,20}$')
-
 # Track whether the subscriber is already running (one per process)
 _subscriber_started = False
 _subscriber_lock = threading.Lock()
 
 
-def _create_mention_notifications(room_id, sender_callsign, message, mentions, chat_message_id):
-    """Create a chat_notification row for each mentioned callsign."""
-    if not mentions:
-        return
-    try:
-        with get_db() as conn:
-            preview = message[:80] + '...' if len(message) > 80 else message
-            for callsign in mentions:
-                if callsign.upper() == sender_callsign.upper():
-                    continue
-                existing = conn.execute(
-                    'SELECT callsign FROM operators WHERE callsign = ?',
-                    (callsign.upper(),)
-                ).fetchone()
-                if existing:
-                    conn.execute(
-                        '''INSERT INTO chat_notifications
-                           (recipient_callsign, sender_callsign, room_id,
-                            message_preview, chat_message_id)
-                           VALUES (?, ?, ?, ?, ?)''',
-                        (callsign.upper(), sender_callsign.upper(),
-                         room_id, preview, chat_message_id)
-                    )
-    except Exception:
-        logger.exception("Failed to create mention notifications")
-
-
 def _on_connect(client, userdata, flags, reason_code, properties=None):
     """Called when the client connects to the broker."""
     logger.info("MQTT subscriber connected to broker (rc=%s)", reason_code)
@@ -78,7 +48,7 @@ def _on_message(client, userdata, msg):
             return
 
         # Validate callsign format
-        if not _CALLSIGN_RE.match(callsign.upper()):
+        if not is_valid_callsign(callsign):
             logger.warning("Invalid callsign format from MQTT: %s", callsign[:20])
             return
 
@@ -126,15 +96,12 @@ def _on_message(client, userdata, msg):
             reply_to_callsign = reply_to.get('callsign')
             reply_to_text = (reply_to.get('text') or '')[:100]
 
-        msg_id = save_chat_message(
+        # The message and its @mention notifications commit together
+        save_chat_message(
             room_id, callsign, message, source,
-            reply_to_id, reply_to_callsign, reply_to_text
+            reply_to_id, reply_to_callsign, reply_to_text,
+            mentions=payload.get('mentions'),
         )
-
-        # Process @mentions
-        mentions = payload.get('mentions', [])
-        if mentions and msg_id:
-            _create_mention_notifications(room_id, callsign, message, mentions, msg_id)
     except json.JSONDecodeError:
         logger.warning("Received non-JSON MQTT message on %s", msg.topic)
     except Exception:
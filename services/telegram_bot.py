@@ -26,7 +26,7 @@ from config import (
     MODES,
 )
 from core.auth import authenticate_operator
-from core.database import init_database
+from core.database import get_db, init_database
 from features.awards import get_active_awards, get_award_by_id
 from features.blocks import (
     get_all_blocks,
@@ -281,24 +281,35 @@ def get_user_lang(chat_id: int) -> str:
     return link['language'] if link else 'en'
 
 
-# Command handlers
+def _get_award_id_for_room(room_id: int):
+    """Return the award linked to a chat room, or None."""
+    with get_db() as conn:
+        row = conn.execute(
+            'SELECT award_id FROM chat_rooms WHERE id = ?', (room_id,)
+        ).fetchone()
+    return row['award_id'] if row else None
+
+
+# Command handlers.  Every call into the feature layer hits SQLite (and
+# authentication runs bcrypt), so handlers dispatch them with
+# asyncio.to_thread to keep the bot's event loop responsive.
 
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /start command."""
-    lang = get_user_lang(update.effective_chat.id)
+    lang = await asyncio.to_thread(get_user_lang, update.effective_chat.id)
     await update.message.reply_text(t('welcome', lang))
 
 
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /help command."""
-    lang = get_user_lang(update.effective_chat.id)
+    lang = await asyncio.to_thread(get_user_lang, update.effective_chat.id)
     await update.message.reply_text(t('help', lang))
 
 
 async def link_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /link <callsign> <password> command."""
     chat_id = update.effective_chat.id
-    lang = get_user_lang(chat_id)
+    lang = await asyncio.to_thread(get_user_lang, chat_id)
 
     if len(context.args) < 2:
         await update.message.reply_text(t('link_usage', lang))
@@ -307,13 +318,13 @@ async def link_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     callsign = context.args[0].upper()
     password = ' '.join(context.args[1:])  # Password might contain spaces
 
-    success, message, operator = authenticate_operator(callsign, password)
+    success, message, operator = await asyncio.to_thread(authenticate_operator, callsign, password)
     if not success:
         await update.message.reply_text(t('link_failed', lang))
         return
 
     username = update.effective_user.username if update.effective_user else None
-    link_success, link_msg = link_telegram_account(callsign, chat_id, username)
+    link_success, link_msg = await asyncio.to_thread(link_telegram_account, callsign, chat_id, username)
 
     if link_success:
         await update.message.reply_text(
@@ -326,9 +337,9 @@ async def link_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def unlink_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /unlink command."""
     chat_id = update.effective_chat.id
-    lang = get_user_lang(chat_id)
+    lang = await asyncio.to_thread(get_user_lang, chat_id)
 
-    success, message = unlink_telegram_account(chat_id)
+    success, message = await asyncio.to_thread(unlink_telegram_account, chat_id)
     if success:
         await update.message.reply_text(t('unlink_success', lang))
     else:
@@ -338,9 +349,9 @@ async def unlink_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def awards_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /awards command."""
     chat_id = update.effective_chat.id
-    lang = get_user_lang(chat_id)
+    lang = await asyncio.to_thread(get_user_lang, chat_id)
 
-    awards = get_active_awards()
+    awards = await asyncio.to_thread(get_active_awards)
     if not awards:
         await update.message.reply_text(t('no_active_awards', lang))
         return
@@ -354,9 +365,9 @@ async def awards_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def setaward_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /setaward <id> command."""
     chat_id = update.effective_chat.id
-    lang = get_user_lang(chat_id)
+    lang = await asyncio.to_thread(get_user_lang, chat_id)
 
-    link = get_telegram_link_by_chat_id(chat_id)
+    link = await asyncio.to_thread(get_telegram_link_by_chat_id, chat_id)
     if not link:
         await update.message.reply_text(t('not_linked', lang))
         return
@@ -371,21 +382,21 @@ async def setaward_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text(t('setaward_usage', lang))
         return
 
-    award = get_award_by_id(award_id)
+    award = await asyncio.to_thread(get_award_by_id, award_id)
     if not award or not award.get('is_active'):
         await update.message.reply_text(t('award_not_found', lang))
         return
 
-    set_default_award(chat_id, award_id)
+    await asyncio.to_thread(set_default_award, chat_id, award_id)
     await update.message.reply_text(t('award_set', lang, name=award['name']))
 
 
 async def blocks_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /blocks command."""
     chat_id = update.effective_chat.id
-    lang = get_user_lang(chat_id)
+    lang = await asyncio.to_thread(get_user_lang, chat_id)
 
-    link = get_telegram_link_by_chat_id(chat_id)
+    link = await asyncio.to_thread(get_telegram_link_by_chat_id, chat_id)
     if not link:
         await update.message.reply_text(t('not_linked', lang))
         return
@@ -395,12 +406,12 @@ async def blocks_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text(t('no_default_award', lang))
         return
 
-    award = get_award_by_id(award_id)
+    award = await asyncio.to_thread(get_award_by_id, award_id)
     if not award:
         await update.message.reply_text(t('award_not_found', lang))
         return
 
-    blocks = get_all_blocks(award_id)
+    blocks = await asyncio.to_thread(get_all_blocks, award_id)
     if not blocks:
         await update.message.reply_text(t('blocks_empty', lang, award=award['name']))
         return
@@ -415,9 +426,9 @@ async def blocks_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def myblocks_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /myblocks command."""
     chat_id = update.effective_chat.id
-    lang = get_user_lang(chat_id)
+    lang = await asyncio.to_thread(get_user_lang, chat_id)
 
-    link = get_telegram_link_by_chat_id(chat_id)
+    link = await asyncio.to_thread(get_telegram_link_by_chat_id, chat_id)
     if not link:
         await update.message.reply_text(t('not_linked', lang))
         return
@@ -425,7 +436,7 @@ async def myblocks_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     callsign = link['operator_callsign']
     award_id = link.get('default_award_id')
 
-    blocks = get_operator_blocks(callsign, award_id)
+    blocks = await asyncio.to_thread(get_operator_blocks, callsign, award_id)
     if not blocks:
         await update.message.reply_text(t('myblocks_empty', lang))
         return
@@ -437,9 +448,9 @@ async def myblocks_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def block_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /block command - shows band selection keyboard."""
     chat_id = update.effective_chat.id
-    lang = get_user_lang(chat_id)
+    lang = await asyncio.to_thread(get_user_lang, chat_id)
 
-    link = get_telegram_link_by_chat_id(chat_id)
+    link = await asyncio.to_thread(get_telegram_link_by_chat_id, chat_id)
     if not link:
         await update.message.reply_text(t('not_linked', lang))
         return
@@ -469,9 +480,9 @@ async def block_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def unblock_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /unblock command."""
     chat_id = update.effective_chat.id
-    lang = get_user_lang(chat_id)
+    lang = await asyncio.to_thread(get_user_lang, chat_id)
 
-    link = get_telegram_link_by_chat_id(chat_id)
+    link = await asyncio.to_thread(get_telegram_link_by_chat_id, chat_id)
     if not link:
         await update.message.reply_text(t('not_linked', lang))
         return
@@ -479,7 +490,7 @@ async def unblock_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     callsign = link['operator_callsign']
     award_id = link.get('default_award_id')
 
-    success, message, count = unblock_all_for_operator(callsign, award_id)
+    success, message, count = await asyncio.to_thread(unblock_all_for_operator, callsign, award_id)
     if count > 0:
         await update.message.reply_text(t('unblock_success', lang, count=count))
     else:
@@ -489,9 +500,9 @@ async def unblock_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def notifications_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /notifications on|off command."""
     chat_id = update.effective_chat.id
-    lang = get_user_lang(chat_id)
+    lang = await asyncio.to_thread(get_user_lang, chat_id)
 
-    link = get_telegram_link_by_chat_id(chat_id)
+    link = await asyncio.to_thread(get_telegram_link_by_chat_id, chat_id)
     if not link:
         await update.message.reply_text(t('not_linked', lang))
         return
@@ -501,7 +512,7 @@ async def notifications_command(update: Update, context: ContextTypes.DEFAULT_TY
         return
 
     enabled = context.args[0].lower() == 'on'
-    set_notifications_enabled(chat_id, enabled)
+    await asyncio.to_thread(set_notifications_enabled, chat_id, enabled)
 
     if enabled:
         await update.message.reply_text(t('notifications_enabled', lang))
@@ -512,9 +523,9 @@ async def notifications_command(update: Update, context: ContextTypes.DEFAULT_TY
 async def lang_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /lang en|es|gl command."""
     chat_id = update.effective_chat.id
-    lang = get_user_lang(chat_id)
+    lang = await asyncio.to_thread(get_user_lang, chat_id)
 
-    link = get_telegram_link_by_chat_id(chat_id)
+    link = await asyncio.to_thread(get_telegram_link_by_chat_id, chat_id)
     if not link:
         await update.message.reply_text(t('not_linked', lang))
         return
@@ -524,23 +535,23 @@ async def lang_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     new_lang = context.args[0].lower()
-    set_language(chat_id, new_lang)
+    await asyncio.to_thread(set_language, chat_id, new_lang)
     await update.message.reply_text(t('lang_set', new_lang))
 
 
 async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /status command."""
     chat_id = update.effective_chat.id
-    lang = get_user_lang(chat_id)
+    lang = await asyncio.to_thread(get_user_lang, chat_id)
 
-    link = get_telegram_link_by_chat_id(chat_id)
+    link = await asyncio.to_thread(get_telegram_link_by_chat_id, chat_id)
     if not link:
         await update.message.reply_text(t('not_linked', lang))
         return
 
     award_name = "Not set"
     if link.get('default_award_id'):
-        award = get_award_by_id(link['default_award_id'])
+        award = await asyncio.to_thread(get_award_by_id, link['default_award_id'])
         if award:
             award_name = award['name']
 
@@ -564,7 +575,7 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await query.answer()
 
     chat_id = update.effective_chat.id
-    lang = get_user_lang(chat_id)
+    lang = await asyncio.to_thread(get_user_lang, chat_id)
 
     data = query.data
 
@@ -605,7 +616,7 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await query.edit_message_text(t('cancelled', lang))
             return
 
-        link = get_telegram_link_by_chat_id(chat_id)
+        link = await asyncio.to_thread(get_telegram_link_by_chat_id, chat_id)
         if not link:
             await query.edit_message_text(t('not_linked', lang))
             return
@@ -617,7 +628,7 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await query.edit_message_text(t('no_default_award', lang))
             return
 
-        success, message = block_band_mode(callsign, band, mode, award_id)
+        success, message = await asyncio.to_thread(block_band_mode, callsign, band, mode, award_id)
 
         if success:
             if "previous" in message.lower():
@@ -693,15 +704,10 @@ class MQTTNotifier:
 
             if len(topic_parts) >= 4 and topic_parts[2] == 'room':
                 # Look up award from room
-                from core.database import get_db
                 try:
-                    with get_db() as conn:
-                        row = conn.execute(
-                            'SELECT award_id FROM chat_rooms WHERE id = ?',
-                            (int(topic_parts[3]),)
-                        ).fetchone()
-                        if row:
-                            award_id = row['award_id']
+                    award_id = await asyncio.to_thread(
+                        _get_award_id_for_room, int(topic_parts[3])
+                    )
                 except Exception:
                     pass
             elif len(topic_parts) >= 3:
@@ -714,7 +720,7 @@ class MQTTNotifier:
                 return
 
             # Get all linked users for this award
-            linked_users = get_linked_users_for_award(award_id)
+            linked_users = await asyncio.to_thread(get_linked_users_for_award, award_id)
 
             for user in linked_users:
                 # Don't notify the actor
@@ -768,7 +774,7 @@ class MQTTNotifier:
                 if mentioned_callsign.upper() == sender.upper():
                     continue
 
-                link = get_telegram_link_by_callsign(mentioned_callsign)
+                link = await asyncio.to_thread(get_telegram_link_by_callsign, mentioned_callsign)
                 if not link or not link.get('notifications_enabled'):
                     continue
 
@@ -2,6 +2,7 @@
 """Complete test script including admin roles and translations."""
 import os
 import gc
+import sqlite3
 
 # Use a test database - MUST be set before importing database module
 os.environ['DATABASE_PATH'] = 'test_complete.db'
@@ -136,6 +137,79 @@ def run_tests():
     assert success, f"Failed to unblock: {message}"
     print(f"✓ Unblocked: {message}\n")
 
+    print("17. Testing backup and restore...")
+    wait_for_db()
+    backup = db.get_database_backup()
+    awards_before = len(db.get_all_awards())
+    success, message, _ = db.create_award("Post-backup Award", "Gone after restore")
+    assert success, f"Failed to create award: {message}"
+    success, message = db.restore_database_from_backup(backup)
+    assert success, f"Failed to restore: {message}"
+    assert len(db.get_all_awards()) == awards_before, "Restore did not roll back the new award"
+    assert db.get_operator("W1XYZ") is not None, "Operator missing after restore"
+    # A file copied from a live WAL-mode database carries WAL header bytes
+    wal_image = backup[:18] + b"\x02\x02" + backup[20:]
+    success, message = db.restore_database_from_backup(wal_image)
+    assert success, f"Failed to restore WAL-mode image: {message}"
+    print(f"✓ {message}\n")
+
+    print("18. Testing restore rejects bad uploads...")
+    success, message = db.restore_database_from_backup(b"not a database")
+    assert not success and "not a valid" in message.lower(), f"Garbage accepted: {message}"
+    success, message = db.restore_database_from_backup(backup[:len(backup) // 2])
+    assert not success, "Truncated backup accepted"
+    success, message = db.restore_database_from_backup(
+        b"SQLite format 3\x00" + b"\xff" * (len(backup) - 16)
+    )
+    assert not success, "Corrupted backup accepted"
+    empty = sqlite3.connect(':memory:')
+    empty.execute('CREATE TABLE operators (callsign TEXT)')
+    success, message = db.restore_database_from_backup(empty.serialize())
+    empty.close()
+    assert not success and "missing required tables" in message.lower(), f"Incomplete backup accepted: {message}"
+    assert len(db.get_all_awards()) == awards_before, "Live database changed by a rejected restore"
+    print("✓ Garbage, truncated, corrupted and incomplete backups rejected\n")
+
+    print("19. Testing mark-all-read skips announcements already read...")
+    wait_for_db()
+    for title in ("First", "Second", "Third"):
+        success, message = db.create_announcement(title, "Body", "W1XYZ")
+        assert success, f"Failed to create announcement: {message}"
+    first_id = next(a['id'] for a in db.get_active_announcements() if a['title'] == "First")
+    success, message = db.mark_announcement_read(first_id, "W1ABC")
+    assert success, f"Failed to mark read: {message}"
+    assert db.get_unread_announcement_count("W1ABC") == 2, "Expected 2 unread announcements"
+    success, message = db.mark_all_announcements_read("W1ABC")
+    assert success and message == "Marked 2 announcements as read", f"Unexpected result: {message}"
+    success, message = db.mark_all_announcements_read("W1ABC")
+    assert success and message == "Marked 0 announcements as read", f"Duplicate reads inserted: {message}"
+    assert db.get_unread_announcement_count("W1ABC") == 0, "Announcements still unread"
+    assert db.get_unread_announcement_count("W1XYZ") == 3, "Other operator's reads changed"
+    print(f"✓ {message}\n")
+
+    print("20. Testing restore of a backup with a different page size...")
+    wait_for_db()
+    image = bytearray(db.get_database_backup())
+    image[18:20] = b"\x01\x01"  # WAL header bytes; memory databases need rollback
+    source = sqlite3.connect(':memory:')
+    source.deserialize(image)
+    small_pages = sqlite3.connect(':memory:')
+    small_pages.execute('PRAGMA page_size=1024')
+    small_pages.executescript('\n'.join(source.iterdump()))
+    assert small_pages.execute('PRAGMA page_size').fetchone()[0] == 1024
+    small_backup = small_pages.serialize()
+    source.close()
+    small_pages.close()
+    success, message, _ = db.create_award("Post-1024 Award", "Gone after restore")
+    assert success, f"Failed to create award: {message}"
+    success, message = db.restore_database_from_backup(small_backup)
+    assert success, f"Failed to restore 1024-byte-page backup: {message}"
+    award_names = {a['name'] for a in db.get_all_awards()}
+    assert "Test Award" in award_names, f"Rows not restored: {award_names}"
+    assert "Post-1024 Award" not in award_names, "Restore did not roll back the new award"
+    assert db.get_unread_announcement_count("W1XYZ") == 3, "Announcements not restored"
+    print(f"✓ {message}\n")
+
     print("=" * 50)
     print("All complete system tests passed successfully!")
     print("=" * 50)
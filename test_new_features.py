@@ -2,11 +2,17 @@
 """Test script for new features: one block per operator, Galician translations, admin unblock."""
 import os
 import gc
+import socket
+import threading
+import time
 
 # Use a test database - MUST be set before importing database module
 os.environ['DATABASE_PATH'] = 'test_new_features.db'
 
 import database as db
+from core.database import get_db
+from core.validation import is_valid_callsign
+from features import dx_cluster
 from i18n.translations import get_text, AVAILABLE_LANGUAGES
 
 def wait_for_db():
@@ -126,6 +132,109 @@ def run_tests():
     assert gl_timeline, f"Galician timeline empty: {gl_timeline}"
     print("✓ Activity dashboard translations verified\n")
 
+    # Test block history rows written by block/switch/unblock
+    print("14. Testing block history rows...")
+    wait_for_db()
+    success, message, history_award_id = db.create_award("History Award", "For history")
+    assert success, f"Failed to create award: {message}"
+    success, message = db.block_band_mode("W1ABC", "20m", "CW", history_award_id)
+    assert success, f"Failed to block: {message}"
+    success, message = db.block_band_mode("W1XYZ", "20m", "CW", history_award_id)
+    assert not success and "W1ABC" in message, f"Collision should be rejected: {message}"
+    success, message = db.block_band_mode("W1ABC", "40m", "CW", history_award_id)
+    assert success and "previous" in message.lower(), f"Switch failed: {message}"
+    success, message = db.unblock_band_mode("W1ABC", "40m", "CW", history_award_id)
+    assert success, f"Failed to unblock: {message}"
+    with get_db() as conn:
+        history = [dict(row) for row in conn.execute(
+            """SELECT operator_callsign, band, mode, unblocked_at, duration_seconds
+               FROM block_history WHERE award_id = ? ORDER BY id""",
+            (history_award_id,)
+        )]
+    assert [(h['operator_callsign'], h['band']) for h in history] == [
+        ("W1ABC", "20m"), ("W1ABC", "40m")
+    ], f"Unexpected history rows (rejected claim must not add one): {history}"
+    assert all(h['unblocked_at'] is not None for h in history), f"History left open: {history}"
+    assert all(h['duration_seconds'] is not None for h in history), f"Duration missing: {history}"
+    print(f"✓ {len(history)} history rows opened and closed\n")
+
+    # Test that deleting an award cascades to its dependent rows
+    print("15. Testing award delete cascade...")
+    wait_for_db()
+    success, message, doomed_id = db.create_award("Doomed Award", "To be deleted")
+    assert success, f"Failed to create award: {message}"
+    db.sync_award_rooms()
+    success, message = db.add_manager("W1ABC", doomed_id)
+    assert success, f"Failed to add manager: {message}"
+    success, message = db.add_member("W1XYZ", doomed_id)
+    assert success, f"Failed to add member: {message}"
+    success, message = db.block_band_mode("W1XYZ", "15m", "SSB", doomed_id)
+    assert success, f"Failed to block: {message}"
+    with get_db() as conn:
+        room_id = conn.execute(
+            'SELECT id FROM chat_rooms WHERE award_id = ?', (doomed_id,)
+        ).fetchone()[0]
+    assert db.save_chat_message(room_id, "W1XYZ", "hi @W1ABC", mentions=["W1ABC"])
+    assert db.get_unread_chat_notification_count("W1ABC") == 1, "Mention notification not stored"
+    success, message = db.delete_award(doomed_id)
+    assert success, f"Failed to delete award: {message}"
+    with get_db() as conn:
+        leftovers = conn.execute(
+            """SELECT (SELECT COUNT(*) FROM band_mode_blocks WHERE award_id = :a),
+                      (SELECT COUNT(*) FROM award_managers WHERE award_id = :a),
+                      (SELECT COUNT(*) FROM award_members WHERE award_id = :a),
+                      (SELECT COUNT(*) FROM chat_rooms WHERE award_id = :a),
+                      (SELECT COUNT(*) FROM chat_messages WHERE room_id = :r),
+                      (SELECT COUNT(*) FROM chat_notifications WHERE room_id = :r)""",
+            {'a': doomed_id, 'r': room_id}
+        ).fetchone()
+    assert tuple(leftovers) == (0, 0, 0, 0, 0, 0), f"Rows left after delete: {tuple(leftovers)}"
+    # Other awards keep their data
+    assert db.get_award_by_id(history_award_id) is not None, "Unrelated award was deleted"
+    success, message = db.delete_award(doomed_id)
+    assert not success and "not found" in message.lower(), f"Second delete should fail: {message}"
+    print("✓ Blocks, rosters, room, messages and notifications removed\n")
+
+    # Test that banner lines ending in ':' or '>' are not taken for a prompt
+    print("16. Testing DX cluster prompt detection...")
+    node, client = socket.socketpair()
+
+    def _send_banner():
+        node.sendall(b"Welcome to EA4URE-2\r\nRules:\r\n<html>\r\n")
+        time.sleep(0.1)
+        node.sendall(b"Please enter your call: ")
+
+    sender = threading.Thread(target=_send_banner)
+    sender.start()
+    banner = dx_cluster._read_until_prompt(client, timeout=5)
+    sender.join()
+    node.close()
+    client.close()
+    assert banner.endswith("Please enter your call: "), f"Read stopped mid-banner: {banner!r}"
+    assert "Rules:" in banner, f"Banner incomplete: {banner!r}"
+    print("✓ Multi-line banner read through to the login prompt\n")
+
+    # Test callsign validation shared by the DX cluster and MQTT chat paths
+    print("17. Testing callsign validation...")
+    for callsign in ("EA1RFI", "ea1rfi", "EA1RFI/P", "F/EA1RFI"):
+        assert is_valid_callsign(callsign), f"{callsign} should be accepted"
+    for callsign in ("EA1RFI-2", "EA1 RFI", "EA1RFI\r\nDX", "E", "", "EA1RFI;"):
+        assert not is_valid_callsign(callsign), f"{callsign!r} should be rejected"
+    assert is_valid_callsign("EA1RFI-2", allow_ssid=True), "SSID login should be accepted"
+    assert is_valid_callsign("M0ABC-1", allow_ssid=True), "SSID login should be accepted"
+    assert not is_valid_callsign("EA1RFI 2", allow_ssid=True), "Whitespace login should be rejected"
+    # Port 1 on localhost refuses, so reaching it means validation passed
+    success, message = dx_cluster.send_spot_to_cluster(
+        "127.0.0.1", 1, "EA1RFI-2", "EA1RFI/P", 14025.0, timeout=2)
+    assert not success and "refused" in message.lower(), f"Valid spot rejected: {message}"
+    success, message = dx_cluster.send_spot_to_cluster(
+        "127.0.0.1", 1, "EA1RFI\r\nbye", "EA1RFI/P", 14025.0, timeout=2)
+    assert message == "Invalid cluster login callsign", f"Unexpected result: {message}"
+    success, message = dx_cluster.send_spot_to_cluster(
+        "127.0.0.1", 1, "EA1RFI-2", "EA1RFI-2", 14025.0, timeout=2)
+    assert message == "Invalid spotted callsign", f"Unexpected result: {message}"
+    print("✓ Accepted and rejected callsign forms verified\n")
+
     print("=" * 50)
     print("All new features tests passed successfully!")
     print("=" * 50)
@@ -312,6 +312,22 @@ def run_tests():
     except ImportError as e:
         print(f"[SKIP] Chart tests skipped (missing dependency: {e})\n")
 
+    print("24. Testing duplicates inside one upload...")
+    success, _, dup_award_id = db.create_award("TEST2", "Duplicate test award")
+    assert success and dup_award_id, "Failed to create award"
+    dup_adif = b"""<adif_ver:5>3.1.4<eoh>
+<call:6>EA1ABC<band:3>20m<mode:2>CW<qso_date:8>20260103<time_on:4>0900<eor>
+<call:6>EA1ABC<band:3>20m<mode:2>CW<qso_date:8>20260103<time_on:4>0900<eor>
+<call:6>DL2XYZ<band:3>20m<mode:2>CW<qso_date:8>20260103<time_on:4>0905<eor>
+"""
+    dup_result = qso_log.ingest_adif_bytes(dup_award_id, "EA4TEST", dup_adif, "dup.adi")
+    assert dup_result['inserted'] == 2, f"Repeated QSO should insert once: {dup_result}"
+    assert dup_result['duplicates'] == 1, f"Repeated QSO should count once: {dup_result}"
+    assert db.count_qsos(award_id=dup_award_id, operator_callsign="EA4TEST") == 2
+    batch = qso_log.get_upload_batches(dup_award_id, "EA4TEST")[0]
+    assert (batch['inserted'], batch['duplicates']) == (2, 1), f"Batch counts wrong: {batch}"
+    print(f"[OK] In-file duplicate skipped: {dup_result}\n")
+
     print("=" * 50)
     print("All QSO log tests passed successfully!")
     print("=" * 50)
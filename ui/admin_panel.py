@@ -313,7 +313,7 @@ def render_award_management_tab(t):
         for award in awards:
             with st.expander(f"{'✅' if award['is_active'] else '❌'} {award['name']}", expanded=False):
                 # Show current image if exists
-                image_result = db.get_award_image(award['id'])
+                image_result = db.get_award_image(award['id']) if award.get('has_image') else None
                 if image_result:
                     image_data, image_type = image_result
                     st.write(f"**{t['current_image']}:**")
@@ -149,7 +149,7 @@ def render_award_selector(active_awards, t, key_suffix="", show_details=True):
     current_award = next((a for a in active_awards if a['id'] == st.session_state.current_award_id), None)
     if current_award:
         # Check if there's an image, description, or QRZ link to show
-        image_result = _cached_award_image(current_award['id'])
+        image_result = _cached_award_image(current_award['id']) if current_award.get('has_image') else None
         has_content = current_award.get('description') or image_result or current_award.get('qrz_link')
 
         if has_content:
@@ -1039,19 +1039,16 @@ def _render_qso_log_view(
             hide_index=True,
         )
 
-        # ADIF export: pull everything matching the current filter, not just
-        # the visible page. Capped at 50k to avoid runaway downloads.
-        export_qsos = db.get_qsos_page(
+        # ADIF export: everything matching the current filter, not just the
+        # visible page, streamed from the cursor. Capped at 50k to avoid
+        # runaway downloads.
+        adif_text = db.export_award_qsos_to_adif(
             award_id=award_id,
             operator_callsign=scoped_operator,
-            limit=50000,
-            offset=0,
             band=band_sel,
             mode=mode_sel,
-        )
-        adif_text = db.export_qsos_to_adif(
-            export_qsos,
             station_callsign=award_name,
+            limit=50000,
         )
         st.download_button(
             label=f"📥 {t.get('qso_export_adif', 'Export ADIF')}",